@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from track_archive import TrackArchive
+from tracker_core import Tracker
+
+def _segment(track_id, start, count):
+    return [(0.1 * track_id, 0.2, 1000.0 + k, 5.0, start + 0.5 * k) for k in range(count)]
+
+# Short segments share size-bounded blocks and read back after a save
+def test_small_segments_share_blocks(tmp_path):
+    archive = TrackArchive(block_size=64)
+    for track_id in range(1, 51):
+        archive.add_segment(track_id, _segment(track_id, 0.0, 3), closed=True)
+    archive.save(tmp_path / 'tracks.arc')
+    # 150 points in blocks of at most 64, not one block per segment
+    assert len(archive._blocks) == 3
+
+    reopened = TrackArchive.open(tmp_path / 'tracks.arc')
+    try:
+        for track_id in (1, 22, 50):
+            assert np.allclose(reopened.get_array(track_id), np.array(_segment(track_id, 0.0, 3)))
+        assert reopened.track_ids() == list(range(1, 51))
+    finally:
+        reopened.close()
+
+# Each lifetime of a reused ID is its own instance, the latest one by default
+def test_reused_id_lifetimes_are_kept_apart():
+    archive = TrackArchive(block_size=8)
+    archive.add_segment(1, _segment(1, 0.0, 4))
+    archive.add_segment(1, _segment(1, 2.0, 2), closed=True)
+    archive.add_segment(1, _segment(1, 10.0, 3), closed=True)
+
+    assert archive.instances(1) == [0, 1]
+    assert len(archive.get(1, instance=0)) == 6
+    # The latest lifetime by default
+    assert np.allclose(archive.get_array(1)[:, 4], [10.0, 10.5, 11.0])
+    assert len(archive.get(1, start=0.0, end=20.0, instance=1)) == 3
+
+# Aging points out needs an archive to move them into
+def test_archive_aged_without_archive():
+    tracker = Tracker(2.0, 60.0, 3, 2.0)
+    with pytest.raises(ValueError):
+        tracker.archive_aged(10.0)
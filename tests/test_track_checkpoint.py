@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+import track_checkpoint
+from track_checkpoint import PeriodicCheckpointer, capture_state, decode_tracker, encode_state
+from track_clutter import ClutterMap
+from track_compare import generate_scenario
+from track_initiation import MofNInitiation
+from track_prediction import AlphaBetaPredictor
+from tracker_core import Tracker
+
+SETUPS = {
+    'plain': lambda: Tracker(2.0, 60.0, 3, 2.0),
+    'doppler-index': lambda: Tracker(2.0, 60.0, 3, 2.0, use_doppler_index=True),
+    'predictor': lambda: Tracker(2.0, 60.0, 3, 2.0, predictor=AlphaBetaPredictor(max_speed=60.0)),
+    'm-of-n': lambda: Tracker(2.0, 60.0, 3, 2.0, initiation=MofNInitiation(2, 4)),
+    'no-history': lambda: Tracker(2.0, 60.0, 3, 2.0, keep_history=False),
+    'clutter': lambda: Tracker(2.0, 60.0, 3, 2.0, clutter_map=ClutterMap(50.0, 5.0, 20000.0, decay_time=10.0,
+                                                                         threshold=2.0, mode='restrict')),
+}
+
+def _roundtrip(tracker):
+    return decode_tracker(encode_state(capture_state(tracker)))
+
+# A tracker restored at the midpoint finishes exactly like the uninterrupted run
+@pytest.mark.parametrize('setup', sorted(SETUPS))
+def test_restored_tracker_continues_identically(setup):
+    measurements = generate_scenario(targets=4, scans=40, clutter=1, seed=1)
+    measurements = [m + (f"s{k % 2}",) if k % 3 else m for k, m in enumerate(measurements)]
+    half = len(measurements) // 2
+
+    uninterrupted = SETUPS[setup]()
+    for measurement in measurements:
+        uninterrupted.process(measurement)
+    interrupted = SETUPS[setup]()
+    for measurement in measurements[:half]:
+        interrupted.process(measurement)
+    restored = _roundtrip(interrupted)
+    assert restored.keep_history == interrupted.keep_history
+    for measurement in measurements[half:]:
+        restored.process(measurement)
+
+    assert repr(restored.result()) == repr(uninterrupted.result())
+    if uninterrupted.clutter_map is not None:
+        assert restored.clutter_map.stats(40.0) == uninterrupted.clutter_map.stats(40.0)
+    assert uninterrupted.firm_ids and len(uninterrupted.track_id_list) > 4
+
+# While a write is still running each missed period counts once in `skipped`
+def test_skipped_checkpoints_count_missed_periods(tmp_path, monkeypatch):
+    release = threading.Event()
+    write_atomic = track_checkpoint._write_atomic
+
+    def blocked_write(path, payload):
+        release.wait(5)
+        write_atomic(path, payload)
+
+    monkeypatch.setattr(track_checkpoint, '_write_atomic', blocked_write)
+    tracker = Tracker(2.0, 60.0, 3, 2.0)
+    checkpointer = PeriodicCheckpointer(tracker, str(tmp_path / 'tracker.ckpt'), every=10)
+    for _ in range(100):
+        checkpointer.tick()
+    release.set()
+    checkpointer.close(final=False)
+    assert (checkpointer.written, checkpointer.skipped) == (1, 9)
@@ -0,0 +1,16 @@
+from track_clutter import ClutterMap
+
+# A plot without doppler in a dense cell is suppressed on density alone
+def test_unknown_doppler_is_judged_on_density():
+    clutter_map = ClutterMap(10.0, 2.0, 1000.0, threshold=2.5, max_doppler=5.0)
+    verdicts = [clutter_map.classify((10.0, 1.0, 100.0, float('nan'), float(t))) for t in range(10)]
+    assert verdicts[:3] == ['pass'] * 3
+    assert set(verdicts[3:]) == {'drop'}
+
+# With max_doppler set, a moving plot passes even in a dense cell
+def test_fast_plots_pass_dense_cells():
+    clutter_map = ClutterMap(10.0, 2.0, 1000.0, threshold=2.5, max_doppler=5.0)
+    for t in range(5):
+        clutter_map.classify((10.0, 1.0, 100.0, 0.0, float(t)))
+    assert clutter_map.classify((10.0, 1.0, 100.0, 20.0, 5.0)) == 'pass'
+    assert clutter_map.classify((10.0, 1.0, 100.0, 1.0, 6.0)) == 'drop'
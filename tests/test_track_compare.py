@@ -0,0 +1,36 @@
+import pytest
+
+from track_compare import BaselineDiverged, BaselineTracker, compare_engines, generate_scenario
+from tracker_core import Tracker, load_measurements_from_csv
+
+# On the default scenarios every engine matches the frozen baseline plot for plot, and
+# the comparison is not vacuous: every target is confirmed
+@pytest.mark.parametrize('engine', ['tracker', 'doppler-index'])
+def test_engines_match_baseline_on_confirming_scenario(engine):
+    measurements = generate_scenario(seed=0)
+    report = compare_engines(measurements, engine, repeat=1)
+    assert report['equivalent'], report['differences']
+    assert report['compared'] == report['measurements']
+    assert not report['vacuous'] and report['firm'] == (3, 3)
+
+def test_engines_match_baseline_on_derived_doppler_csv():
+    measurements = load_measurements_from_csv('measurements.csv', doppler='derived')
+    report = compare_engines(measurements, 'doppler-index', repeat=1)
+    assert report['equivalent'] and not report['vacuous']
+
+# The intended divergence: the baseline cannot follow a track that reuses a released ID,
+# while Tracker puts it in the freed slot and carries on. Up to that plot both agree.
+def test_baseline_stops_at_first_id_reuse():
+    measurements = generate_scenario(targets=4, clutter=2, seed=1)
+    baseline = BaselineTracker(2.0, 60.0, 3, 2.0)
+    tracker = Tracker(2.0, 60.0, 3, 2.0)
+    with pytest.raises(BaselineDiverged):
+        for measurement in measurements:
+            baseline.process(measurement)
+            tracker.process(measurement)
+    allocated = len(tracker.track_id_list)
+    slot = tracker.process(measurements[tracker.processed])
+    assert len(tracker.track_id_list) == allocated and tracker.tracks[slot] == [measurements[tracker.processed - 1]]
+
+    report = compare_engines(measurements, 'tracker', repeat=1)
+    assert report['equivalent'] and 0 < report['compared'] < report['measurements']
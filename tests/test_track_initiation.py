@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from track_initiation import MofNInitiation, select_initiation_logic
+from tracker_core import Tracker
+
+# M hits within the last N opportunities confirm a track despite a miss between them
+def test_m_of_n_confirms_through_a_miss():
+    logic = MofNInitiation(3, 4)
+    logic.start(0)
+    logic.start(1)
+    assert not logic.hit(0)
+    assert logic.miss_all(exclude=1) == []
+    assert logic.hit(0)
+    assert logic.firm[0]
+    assert (logic.hits(0), logic.misses(0)) == (3, 0)
+    # A firm track ignores further opportunities
+    assert logic.miss_all() == []
+    assert logic.hits(0) == 3
+
+# delete_n misses in a row delete a tentative track
+def test_tentative_track_deleted_after_delete_n_misses():
+    logic = MofNInitiation(3, 3, delete_n=2)
+    logic.start(0)
+    logic.start(1)
+    assert logic.miss_all(exclude=1) == []
+    assert logic.miss_all() == [0]
+    assert not logic.active[0]
+    assert logic.hit_counts().tolist() == [1, 1]
+    assert logic.miss_counts().tolist() == [2, 1]
+
+# Windows outside 1 <= M <= N <= 64 and unknown modes are rejected
+def test_invalid_windows_and_modes():
+    with pytest.raises(ValueError):
+        MofNInitiation(4, 3)
+    with pytest.raises(ValueError):
+        MofNInitiation(2, 65)
+    with pytest.raises(ValueError):
+        select_initiation_logic('2-of-3')
+    logic = select_initiation_logic('5-state')
+    assert (logic.m, logic.n) == (5, 5)
+
+# A stray plot between the target's plots costs it an opportunity, and 3-of-4 still
+# confirms it on the third plot
+def test_tracker_confirms_with_m_of_n():
+    target = [(30.0, 2.0, 1000.0 + scan, 5.0, float(scan)) for scan in range(3)]
+    stray = (200.0, 2.0, 5000.0, -40.0, 1.5)
+    plots = [target[0], target[1], stray, target[2]]
+
+    m_of_n = Tracker(2.0, 60.0, 3, 2.0, initiation=MofNInitiation(3, 4))
+    for plot in plots[:3]:
+        m_of_n.process(plot)
+    assert not m_of_n.firm_ids
+    m_of_n.process(plots[3])
+    assert 0 in m_of_n.firm_ids
+    hits, misses = m_of_n.result()[3], m_of_n.result()[2]
+    assert (hits[0], misses[0]) == (3, 0)
+    assert np.array_equal(m_of_n.initiation.firm[:2], [True, False])
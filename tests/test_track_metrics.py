@@ -0,0 +1,57 @@
+import threading
+import time
+
+import numpy as np
+
+from track_metrics import LogHistogram, TrackerMetrics
+from track_pipeline import run_pipeline
+from tracker_core import Tracker
+
+# Scrapes taken while other threads record always see buckets, count and sum agree
+def test_histogram_snapshots_stay_consistent():
+    histogram = LogHistogram()
+
+    def record():
+        for _ in range(20000):
+            histogram.observe(1e-3)
+
+    writers = [threading.Thread(target=record) for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    snapshots = []
+    while any(writer.is_alive() for writer in writers):
+        snapshots.append(histogram.snapshot())
+    for writer in writers:
+        writer.join()
+    for counts, count, total in snapshots + [histogram.snapshot()]:
+        assert int(counts.sum()) == count
+        assert np.isclose(total, count * 1e-3)
+    assert histogram.count == 80000
+
+# Chunks of plots far apart, so each starts its own track
+def _chunks(count, size):
+    for chunk in range(count):
+        k = np.arange(chunk * size, (chunk + 1) * size, dtype=np.float64)
+        yield {'azimuth': k % 360.0, 'elevation': np.full(size, 5.0), 'range': 1000.0 + 500.0 * k,
+               'doppler': 40.0 * k, 'timestamp': k}
+
+# The first plot waits until every chunk is parsed, then reads the pipeline's queue depth
+class DepthProbingTracker(Tracker):
+    def process(self, measurement, cartesian=None):
+        if self.processed == 0:
+            deadline = time.monotonic() + 10.0
+            while self.metrics.queue_depth() < 20 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.first_depth = self.metrics.queue_depth()
+        return super().process(measurement, cartesian)
+
+# run_pipeline reports the measurements waiting in its queues through the tracker's metrics
+def test_pipeline_drives_queue_depth():
+    tracker = DepthProbingTracker(2.0, 10.0, 3, 2.0)
+    tracker.metrics = TrackerMetrics(tracker)
+    run_pipeline(_chunks(3, 10), tracker, queue_size=4)
+    # The first chunk has been taken by the associator; the other two are still queued
+    assert tracker.first_depth == 20
+    assert tracker.processed == 30
+    assert tracker.metrics.queue_depth is None
+    assert 'tracker_queue_depth' not in tracker.metrics.render()
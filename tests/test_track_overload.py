@@ -0,0 +1,24 @@
+from track_archive import TrackArchive
+from track_overload import LoadShedder
+from tracker_core import Tracker
+
+def _plot(k, time):
+    return (3.0 * k, 5.0, 1000.0 + 100.0 * k, 10.0 * k, time)
+
+# Without history the oldest track is found by its start time, not its tail
+def test_sheds_oldest_tentative_track_without_history():
+    shedder = LoadShedder(latency_budget=1e-3, shed_fraction=0.01, cooldown=1)
+    tracker = Tracker(2.0, 60.0, 5, 5.0, keep_history=False, archive=TrackArchive())
+    # Three tracks started at t = 0, 1 and 2; the oldest has the newest tail
+    for k in range(3):
+        tracker.process(_plot(k, float(k)))
+    for k, time in ((1, 3.0), (2, 3.0), (0, 3.5)):
+        tracker.process(_plot(k, time))
+    assert [tracker.counts(slot)[0] for slot in range(3)] == [2, 2, 2]
+    assert [track[0][4] for track in tracker.tracks] == [3.5, 3.0, 3.0]
+
+    shedder.observe(tracker, 1.0)
+    assert shedder.events[0]['track_ids'] == [1]
+    assert tracker.tracks[0] == [] and tracker.tracks[1] and tracker.tracks[2]
+    # The shed track is archived like a deleted one
+    assert [point[4] for point in tracker.archive.get(1)] == [3.5]
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import numpy as np
+
+from track_pipeline import run_pipeline
+from tracker_core import Tracker
+
+# Fails on its first event, slowly enough that the association stage fills the events
+# queue before the writer thread dies
+class FailingSink:
+    def write(self, event):
+        time.sleep(0.5)
+        raise IOError("disk full")
+
+def _chunks(plots, chunksize):
+    rng = np.random.default_rng(0)
+    for start in range(0, plots, chunksize):
+        n = min(chunksize, plots - start)
+        yield {
+            'azimuth': rng.uniform(0.0, 360.0, n),
+            'elevation': rng.uniform(0.0, 30.0, n),
+            'range': rng.uniform(100.0, 4000.0, n),
+            'doppler': rng.uniform(-30.0, 30.0, n),
+            'timestamp': np.arange(start, start + n, dtype=np.float64) * 0.01,
+        }
+
+# A sink that raises in the writer thread must stop the pipeline and surface its error
+def test_failing_sink_is_raised_instead_of_hanging():
+    tracker = Tracker(3.0, 60.0, 3, 2.0, keep_history=False, sinks=[FailingSink()])
+    outcome = {}
+
+    def run():
+        try:
+            run_pipeline(_chunks(10000, 100), tracker, queue_size=2)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=20)
+    assert not thread.is_alive(), "run_pipeline did not return"
+    assert isinstance(outcome.get('error'), IOError)
+    assert tracker.sinks and isinstance(tracker.sinks[0], FailingSink)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from track_prediction import AlphaBetaPredictor
+from tracker_core import Tracker, sph2cart
+
+# Once the velocity is known, straight-line motion is predicted exactly
+def test_constant_velocity_is_predicted_exactly():
+    predictor = AlphaBetaPredictor()
+    predictor.start(0, (0.0, 0.0, 0.0), 0.0)
+    for step in range(1, 5):
+        predictor.update(0, (10.0 * step, -5.0 * step, 0.0), float(step))
+    assert np.allclose(predictor.predict(6.0)[0], (60.0, -30.0, 0.0))
+    assert np.allclose(predictor.velocities[0], (10.0, -5.0, 0.0))
+
+    predictor.remove(0)
+    assert np.isnan(predictor.predict(6.0)[0]).all()
+
+# An outbound target moving 100 m per scan against a 60 m gate: the raw-tail gate loses it
+# every scan, the predicted gate holds one track once max_speed bridges the second plot
+def test_prediction_keeps_a_fast_target_in_one_track():
+    plots = [(30.0, 2.0, 1000.0 + 100.0 * scan, 5.0, float(scan)) for scan in range(10)]
+    predicted = Tracker(2.0, 60.0, 3, 2.0, predictor=AlphaBetaPredictor(max_speed=150.0))
+    raw = Tracker(2.0, 60.0, 3, 2.0)
+    for plot in plots:
+        predicted.process(plot)
+        raw.process(plot)
+
+    assert [len(track) for track in predicted.tracks] == [10]
+    assert predicted.firm_ids == {0}
+    assert not raw.firm_ids
+    assert np.allclose(predicted.predictor.predict(10.0)[0], sph2cart(30.0, 2.0, 2000.0), atol=1.0)
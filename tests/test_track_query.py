@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from track_query import TrackQueryIndex
+from tracker_core import Tracker, sph2cart
+
+AZIMUTHS = [0.0, 15.0, 89.0, 135.0, 181.0, 270.0, 300.0, 345.0, 359.5]
+
+# One committed tail per azimuth, with the range growing with the azimuth's position
+def _index(cell_size=250.0):
+    index = TrackQueryIndex(cell_size)
+    for slot, azimuth in enumerate(AZIMUTHS):
+        measurement = (azimuth, 10.0, 1000.0 + 100.0 * slot, 0.0, 0.0)
+        index.update(slot, slot + 1, 'firm' if slot % 2 else 'tentative', measurement, sph2cart(*measurement[:3]))
+    index.commit()
+    return index
+
+# Sector queries match a direct scan of the tails, including wrapping through 0 degrees
+@pytest.mark.parametrize('az_min, az_max', [(10.0, 140.0), (300.0, 20.0), (-30.0, 20.0), (180.0, 180.5), (90.0, 89.0)])
+def test_sector_matches_scan(az_min, az_max):
+    index = _index()
+    found = sorted(record['track_id'] for record in index.sector(az_min, az_max, 1000.0, 1650.0))
+    span = (az_max - az_min) % 360.0
+    expected = [slot + 1 for slot, azimuth in enumerate(AZIMUTHS)
+                if (azimuth - az_min) % 360.0 <= span and 1000.0 + 100.0 * slot <= 1650.0]
+    assert found == expected
+
+# A 360 degree query is the full circle, not an empty span from az_min back to itself
+@pytest.mark.parametrize('az_min', [0.0, 45.0, -180.0])
+def test_full_circle_sector(az_min):
+    index = _index()
+    found = index.sector(az_min, az_min + 360.0, 0.0, 5000.0)
+    assert sorted(record['track_id'] for record in found) == list(range(1, len(AZIMUTHS) + 1))
+    firm = index.sector(az_min, az_min + 720.0, 0.0, 5000.0, state='firm')
+    assert sorted(record['track_id'] for record in firm) == [2, 4, 6, 8]
+
+# Radius and box queries on a tracker's index follow its live tails as they move
+def test_tracker_keeps_index_current():
+    index = TrackQueryIndex(100.0)
+    tracker = Tracker(2.0, 60.0, 3, 2.0, query_index=index)
+    for scan in range(3):
+        tracker.process((45.0, 0.0, 1000.0 + 10.0 * scan, 5.0, float(scan)))
+    center = sph2cart(45.0, 0.0, 1020.0)
+    assert [record['track_id'] for record in index.radius(center, 1.0)] == [1]
+    assert index.radius(sph2cart(45.0, 0.0, 1000.0), 1.0) == []
+    offset = 1020.0 / math.sqrt(2.0)
+    assert len(index.box((offset - 1.0, offset - 1.0, -1.0), (offset + 1.0, offset + 1.0, 1.0))) == 1
+    assert index.version == 3
@@ -0,0 +1,25 @@
+import numpy as np
+
+from track_pairing import InitiationPool
+from track_results import PlotLog
+from tracker_core import Tracker
+
+# A pooled plot that later pairs is logged as the plot that started the track
+def test_pooled_partner_plot_is_logged_as_initiation():
+    plot_log = PlotLog()
+    tracker = Tracker(2.0, 60.0, 3, 2.0, plot_log=plot_log,
+                      initiation_pool=InitiationPool(60.0, 2.0, doppler_tolerance=3.0))
+    # One target moving outward; the first plot is pooled, the second pairs with it
+    for k in range(4):
+        tracker.process((10.0, 5.0, 1000.0 + 10.0 * k, 10.0, 0.5 * k))
+
+    plots = plot_log.plots()
+    assert plots['kind'].tolist() == [1, 2, 2, 2]
+    assert (plots['track_instance'] == 1).all()
+
+    summary = plot_log.summary()
+    assert len(summary) == 1
+    assert summary['plots'][0] == 4
+    assert summary['first_plot'][0] == 0
+    assert summary['first_time'][0] == 0.0
+    assert np.isclose(summary['last_time'][0], 1.5)
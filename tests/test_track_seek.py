@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+
+from track_seek import build_seek_index, load_seek_index, read_time_window, seek_index_path
+from tracker_core import MEASUREMENT_COLUMNS, load_measurement_columns
+
+# 500 rows with a few timestamps out of order and a repeated one
+def _write_csv(path):
+    rng = np.random.default_rng(4)
+    times = np.arange(500) * 0.25
+    times[[40, 41, 300]] = times[[41, 40, 120]]
+    with open(path, 'w') as f:
+        f.write('range,azimuth,elevation,timestamp\n')
+        for t in times:
+            f.write(f"{rng.uniform(10, 20):.6f},{rng.uniform(0, 360):.6f},{rng.uniform(0, 10):.6f},{t:.5f}\n")
+
+def _window(columns, start, end):
+    keep = np.ones(len(columns['timestamp']), dtype=bool)
+    if start is not None:
+        keep &= columns['timestamp'] >= start
+    if end is not None:
+        keep &= columns['timestamp'] <= end
+    return {name: column[keep] for name, column in columns.items()}
+
+# A seek-index window equals a full load filtered by time, with the derived doppler of
+# each block's first row taken from the row before it
+@pytest.mark.parametrize('start, end', [(10.0, 20.0), (None, 5.0), (100.0, None), (29.9, 30.1), (200.0, 300.0)])
+@pytest.mark.parametrize('doppler', ['derived', 'auto'])
+def test_window_matches_full_load(tmp_path, start, end, doppler):
+    path = str(tmp_path / 'plots.csv')
+    _write_csv(path)
+    index = build_seek_index(path, block_rows=32)
+    window = read_time_window(path, start, end, index=index, doppler=doppler)
+    expected = _window(load_measurement_columns(path, doppler=doppler), start, end)
+    for name in MEASUREMENT_COLUMNS:
+        np.testing.assert_array_equal(window[name], expected[name])
+
+# The sidecar is reused while the CSV is unchanged and rebuilt once it changes
+def test_stale_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'plots.csv')
+    _write_csv(path)
+    assert load_seek_index(path, block_rows=64)['meta']['rows'] == 500
+    assert os.path.exists(seek_index_path(path))
+    with open(path, 'a') as f:
+        f.write('15.0,10.0,1.0,125.0\n')
+    with pytest.raises(ValueError):
+        load_seek_index(path, build=False)
+    assert load_seek_index(path)['meta']['rows'] == 501
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from track_compare import generate_scenario
+from tracker_core import Tracker, load_measurements_from_csv
+
+# Plots far apart in position and doppler, so none of them associates with another
+def _far_plot(k):
+    return (float(10 * k % 360), 5.0, 1000.0 + 500.0 * k, 40.0 * k, float(k))
+
+# A track that reuses a released ID lives in that ID's slot, and deleting it later works
+def test_reused_id_takes_over_its_freed_slot():
+    tracker = Tracker(2.0, 10.0, 3, 100.0)
+    for k in range(4):
+        tracker.process(_far_plot(k))
+    assert not tracker.tracks[0] and tracker.track_id_list[0]['state'] == 'free'
+
+    slot = tracker.process(_far_plot(4))
+    assert slot == 0
+    assert tracker.tracks[0] == [_far_plot(4)]
+    assert tracker.track_id_list[0] == {'id': 1, 'state': 'occupied'}
+    assert len(tracker.tracks) == len(tracker.track_id_list)
+
+    for k in range(5, 40):
+        tracker.process(_far_plot(k))
+    assert len(tracker.tracks) == len(tracker.track_id_list)
+    for slot, track in enumerate(tracker.tracks):
+        assert bool(track) == (tracker.track_id_list[slot]['state'] == 'occupied')
+
+# Gates every slot, as the tracker did before candidates were pruned
+class FullScanTracker(Tracker):
+    def _candidate_ids(self, measurement_doppler, rate_correlated=None):
+        return range(len(self.tracks))
+
+def _without_doppler(measurements):
+    return [measurement[:3] + (float('nan'),) + measurement[4:] for measurement in measurements]
+
+# Plots without doppler only gate the tracks whose range rate they fit, with the same
+# assignments as gating every track
+def test_range_rate_pruning_matches_full_scan():
+    measurements = _without_doppler(generate_scenario(targets=4, scans=40, clutter=1, seed=2))
+    pruned = Tracker(2.0, 60.0, 3, 2.0)
+    full = FullScanTracker(2.0, 60.0, 3, 2.0)
+    gated = live = 0
+    for measurement in measurements:
+        correlated = pruned._range_rate_gate().gate(measurement[2], measurement[4], pruned.doppler_threshold)[0]
+        gated += len(pruned._candidate_ids(measurement[3], correlated))
+        live += sum(1 for track in pruned.tracks if track)
+        assert pruned.process(measurement) == full.process(measurement)
+    assert repr(pruned.result()) == repr(full.result())
+    assert pruned.firm_ids
+    assert gated < live
+
+# Two tracks on the same target merge even when their dopplers are unknown or infinite
+@pytest.mark.parametrize('dopplers', [(float('nan'), float('nan')), (float('inf'), float('-inf')), (float('nan'), 1.0)])
+def test_merge_duplicates_skips_unknown_doppler(dopplers):
+    tracker = Tracker(2.0, 10.0, 3, 2.0)
+    tracker.process((20.0, 5.0, 500.0, dopplers[0], 0.0))
+    tracker.process((20.0, 5.0, 500.0, dopplers[1], 0.0))
+    assert sum(1 for track in tracker.tracks if track) == 2
+    assert tracker.merge_duplicates(5.0, 2.0, 1.0) == [(0, 1)]
+    assert sum(1 for track in tracker.tracks if track) == 1
+
+# With merge_tolerances the duplicate merge runs every merge_every measurements, and a
+# plot whose track was folded away reports the track it was merged into
+def test_periodic_duplicate_merge():
+    tracker = Tracker(2.0, 10.0, 7, 2.0, merge_tolerances=(5.0, 2.0, 1.0), merge_every=2)
+    nan = float('nan')
+    assert tracker.process((20.0, 5.0, 500.0, nan, 0.0)) == 0
+    assert tracker.process((20.0, 5.0, 500.0, nan, 0.0)) == 0
+    assert sum(1 for track in tracker.tracks if track) == 1
+
+    assert tracker.process((20.0, 5.0, 900.0, nan, 1.0)) == 1
+    assert tracker.process((20.0, 5.0, 900.0, nan, 1.0)) == 1
+    assert tracker.process((20.0, 5.0, 900.0, nan, 1.0)) == 2
+    assert sum(1 for track in tracker.tracks if track) == 3
+
+# The doppler bin index only skips tracks the doppler gate would reject, so assignments
+# match a full scan, including through clutter, ID reuse and infinite dopplers
+@pytest.mark.parametrize('seed', [0, 3])
+def test_doppler_index_matches_full_scan(seed):
+    measurements = generate_scenario(targets=4, scans=40, clutter=1, seed=seed)
+    measurements = [measurement[:3] + (float('inf'),) + measurement[4:] if k % 17 == 0 else measurement
+                    for k, measurement in enumerate(measurements)]
+    indexed = Tracker(2.0, 60.0, 3, 2.0, use_doppler_index=True)
+    full = FullScanTracker(2.0, 60.0, 3, 2.0)
+    assert indexed.doppler_index is not None
+    for measurement in measurements:
+        assert indexed.process(measurement) == full.process(measurement)
+    assert repr(indexed.result()) == repr(full.result())
+    assert indexed.firm_ids
+    assert len(indexed.track_id_list) > sum(1 for track in indexed.tracks if track)
+
+# float32 loading rounds everything but the timestamps, which keep full resolution
+def test_load_measurements_precision(tmp_path):
+    path = tmp_path / 'plots.csv'
+    path.write_text('range,azimuth,elevation,doppler,timestamp\n1000.123456789,10.1,2.2,3.3,1700000000.123456\n')
+    single = load_measurements_from_csv(str(path), precision='float32')[0]
+    double = load_measurements_from_csv(str(path))[0]
+    assert [value.dtype for value in single] == [np.float32] * 4 + [np.float64]
+    assert single[:4] == tuple(np.float32(value) for value in double[:4])
+    assert single[4] == double[4] == 1700000000.123456
+    with pytest.raises(ValueError):
+        load_measurements_from_csv(str(path), precision='float16')
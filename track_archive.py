@@ -0,0 +1,240 @@
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# Compressed archive of track histories for after-action review. Points are stored as the
+# five numeric columns (az, el, range, doppler, time), quantized to the per-column step in
+# ARCHIVE_SCALES, delta-encoded, narrowed to the smallest integer type that holds the
+# deltas and zlib-compressed. Segments are buffered and written in shared blocks of up to
+# `block_size` points, grouped by track so each track's rows are contiguous in a block.
+# The index maps each track instance -- one lifetime of a track ID, since IDs are reused
+# after deletion -- to its row ranges and their time spans, so one track or one time
+# window can be decoded without touching the rest. Non-finite values (e.g. an infinite
+# derived doppler) are kept exactly as per-block exceptions.
+ARCHIVE_MAGIC = b'TRKARC1\0'
+# Version 2 replaced per-track blocks with shared blocks keyed by track instance;
+# version 1 files still open, each track ID as a single instance 0.
+ARCHIVE_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+ARCHIVE_SCALES = (1e-6, 1e-6, 1e-4, 1e-4, 1e-6)
+_TRAILER = struct.Struct('<Q')
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+def _encode_block(points, scales, level):
+    finite = np.isfinite(points)
+    exceptions = [[int(row), int(col), repr(float(points[row, col]))] for row, col in np.argwhere(~finite)]
+    quantized = np.round(np.where(finite, points, 0.0) / scales).astype(np.int64)
+    deltas = np.diff(quantized, axis=0, prepend=np.zeros((1, quantized.shape[1]), dtype=np.int64))
+    dtypes = []
+    parts = []
+    for column in deltas.T:
+        low, high = (int(column.min()), int(column.max())) if len(column) else (0, 0)
+        dtype = next(t for t in _INT_TYPES if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+        dtypes.append(np.dtype(dtype).str)
+        parts.append(column.astype(dtype).tobytes())
+    meta = {
+        'count': len(points),
+        'start': float(np.nanmin(points[:, 4])) if len(points) else 0.0,
+        'end': float(np.nanmax(points[:, 4])) if len(points) else 0.0,
+        'dtypes': dtypes,
+        'exceptions': exceptions,
+    }
+    return meta, zlib.compress(b''.join(parts), level)
+
+def _decode_block(meta, payload, scales):
+    raw = zlib.decompress(payload)
+    count = meta['count']
+    columns = []
+    offset = 0
+    for dtype in meta['dtypes']:
+        dtype = np.dtype(dtype)
+        deltas = np.frombuffer(raw, dtype=dtype, count=count, offset=offset).astype(np.int64)
+        offset += dtype.itemsize * count
+        columns.append(np.cumsum(deltas))
+    points = np.column_stack(columns).astype(np.float64) * scales if count else np.zeros((0, len(scales)))
+    for row, col, value in meta['exceptions']:
+        points[row, col] = float(value)
+    return points
+
+class TrackArchive:
+    def __init__(self, block_size=4096, scales=ARCHIVE_SCALES, level=6):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        self.block_size = block_size
+        self.scales = np.asarray(scales, dtype=np.float64)
+        self.level = level
+        # Written blocks as [meta, payload]; payload is None until read from `_file`
+        self._blocks = []
+        # (track ID, instance) -> list of {'block', 'first', 'count', 'start', 'end'} row ranges
+        self._index = {}
+        # Segments not yet in a block, as ((track ID, instance), points)
+        self._pending = []
+        self._pending_points = 0
+        # track ID -> instance that the next segment of that ID belongs to
+        self._instances = {}
+        self._file = None
+
+    # Append a segment of measurements for a track ID; aged segments of a live track go to
+    # its current instance. Pass closed=True with the last segment of a deleted track so
+    # a later track reusing the ID starts a new instance.
+    def add_segment(self, track_id, measurements, closed=False):
+        instance = self._instances.get(track_id, 0)
+        if measurements:
+            points = np.array([measurement[:5] for measurement in measurements], dtype=np.float64)
+            self._pending.append(((track_id, instance), points))
+            self._pending_points += len(points)
+        if closed:
+            self._instances[track_id] = instance + 1
+        if self._pending_points >= self.block_size:
+            self.flush(partial=False)
+
+    # Encode the buffered segments into blocks of `block_size` points. With partial=False
+    # only full blocks are written and the remainder stays buffered.
+    def flush(self, partial=True):
+        if not self._pending:
+            return
+        # Stable sort keeps each instance's segments in arrival (time) order
+        pending = sorted(self._pending, key=lambda item: item[0])
+        keys = [key for key, _ in pending]
+        lengths = np.array([len(points) for _, points in pending])
+        ends = np.cumsum(lengths)
+        points = np.concatenate([points for _, points in pending])
+        self._pending = []
+        self._pending_points = 0
+        written = len(points) if partial else len(points) - len(points) % self.block_size
+        for key, end, length in zip(keys, ends.tolist(), lengths.tolist()):
+            if end > written:
+                first = max(end - length, written)
+                self._pending.append((key, points[first:end]))
+                self._pending_points += end - first
+        for chunk_start in range(0, written, self.block_size):
+            chunk_end = min(chunk_start + self.block_size, written)
+            block_no = len(self._blocks)
+            self._blocks.append(list(_encode_block(points[chunk_start:chunk_end], self.scales, self.level)))
+            for key, end, length in zip(keys, ends.tolist(), lengths.tolist()):
+                first, last = max(end - length, chunk_start), min(end, chunk_end)
+                if first >= last:
+                    continue
+                times = points[first:last, 4]
+                self._index.setdefault(key, []).append({
+                    'block': block_no, 'first': first - chunk_start, 'count': last - first,
+                    'start': float(np.nanmin(times)), 'end': float(np.nanmax(times))})
+
+    def track_ids(self):
+        return sorted({track_id for track_id, _ in self._index} | {key[0] for key, _ in self._pending})
+
+    # Archived instances of a track ID, oldest first
+    def instances(self, track_id):
+        return sorted({instance for key_id, instance in self._index if key_id == track_id}
+                      | {key[1] for key, _ in self._pending if key[0] == track_id})
+
+    def _payload(self, block):
+        meta, payload = block
+        if payload is None:
+            self._file.seek(meta['offset'])
+            payload = self._file.read(meta['size'])
+        return payload
+
+    # Decoded (N, 5) float64 array for one instance of a track ID (the latest one by
+    # default), optionally limited to start <= t <= end. Only blocks holding rows of that
+    # instance within the window are decompressed.
+    def get_array(self, track_id, start=None, end=None, instance=None):
+        if instance is None:
+            instances = self.instances(track_id)
+            if not instances:
+                return np.zeros((0, 5))
+            instance = instances[-1]
+        key = (track_id, instance)
+        decoded = {}
+        pieces = []
+        for entry in self._index.get(key, []):
+            if start is not None and entry['end'] < start - self.scales[4]:
+                continue
+            if end is not None and entry['start'] > end + self.scales[4]:
+                continue
+            block_no = entry['block']
+            if block_no not in decoded:
+                block = self._blocks[block_no]
+                decoded[block_no] = _decode_block(block[0], self._payload(block), self.scales)
+            pieces.append(decoded[block_no][entry['first']:entry['first'] + entry['count']])
+        pieces.extend(points for pending_key, points in self._pending if pending_key == key)
+        if not pieces:
+            return np.zeros((0, 5))
+        points = np.concatenate(pieces)
+        points = points[np.argsort(points[:, 4], kind='stable')]
+        # Stored times are quantized, so the window edges get half a step of slack
+        slack = self.scales[4] / 2
+        if start is not None:
+            points = points[points[:, 4] >= start - slack]
+        if end is not None:
+            points = points[points[:, 4] <= end + slack]
+        return points
+
+    # Same as get_array, as measurement tuples
+    def get(self, track_id, start=None, end=None, instance=None):
+        return [tuple(row) for row in self.get_array(track_id, start, end, instance).tolist()]
+
+    def compressed_bytes(self):
+        return sum(block[0].get('size', 0) if block[1] is None else len(block[1]) for block in self._blocks)
+
+    # Flush, then write all blocks followed by a JSON index of their offsets and an
+    # 8-byte pointer to that index
+    def save(self, path):
+        self.flush()
+        tmp_path = f"{path}.tmp"
+        index = {'version': ARCHIVE_VERSION, 'scales': self.scales.tolist(), 'block_size': self.block_size,
+                 'blocks': [], 'tracks': {},
+                 'instances': {str(track_id): instance for track_id, instance in self._instances.items()}}
+        with open(tmp_path, 'wb') as f:
+            f.write(ARCHIVE_MAGIC)
+            for block in self._blocks:
+                payload = self._payload(block)
+                index['blocks'].append(dict(block[0], offset=f.tell(), size=len(payload)))
+                f.write(payload)
+            for (track_id, instance), entries in self._index.items():
+                index['tracks'][f"{track_id}:{instance}"] = entries
+            index_offset = f.tell()
+            f.write(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+            f.write(_TRAILER.pack(index_offset))
+        os.replace(tmp_path, path)
+
+    # Open a saved archive; only the index is read, blocks are read on demand
+    @classmethod
+    def open(cls, path):
+        f = open(path, 'rb')
+        if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            f.close()
+            raise ValueError("Not a track archive.")
+        f.seek(-_TRAILER.size, os.SEEK_END)
+        end = f.tell()
+        (index_offset,) = _TRAILER.unpack(f.read(_TRAILER.size))
+        f.seek(index_offset)
+        index = json.loads(f.read(end - index_offset).decode('utf-8'))
+        if index['version'] not in _READABLE_VERSIONS:
+            f.close()
+            raise ValueError(f"Unsupported archive version {index['version']}.")
+        archive = cls(block_size=index['block_size'], scales=index['scales'])
+        archive._file = f
+        if index['version'] == 1:
+            # One block list per track ID; each block becomes a full-block row range
+            for track_id, metas in index['tracks'].items():
+                entries = archive._index.setdefault((int(track_id), 0), [])
+                for meta in metas:
+                    entries.append({'block': len(archive._blocks), 'first': 0, 'count': meta['count'],
+                                    'start': meta['start'], 'end': meta['end']})
+                    archive._blocks.append([meta, None])
+            return archive
+        archive._blocks = [[meta, None] for meta in index['blocks']]
+        for key, entries in index['tracks'].items():
+            track_id, instance = key.split(':')
+            archive._index[(int(track_id), int(instance))] = entries
+        archive._instances = {int(track_id): instance for track_id, instance in index['instances'].items()}
+        return archive
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,179 @@
+import csv
+import glob
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Nightly batch runs: independent tracking jobs over many measurement files, fanned out
+# on a process pool. Each input gets its own event file in the output directory and a
+# row in summary.csv; a failing file is recorded there instead of aborting the batch.
+
+SUMMARY_FIELDS = ('file', 'status', 'measurements', 'live_tracks', 'firm_tracks', 'tentative_tracks',
+                  'track_ids', 'seconds', 'output', 'error')
+
+# Expand a directory, glob pattern or file path (or a list of them) into sorted CSV paths
+def collect_input_files(inputs):
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = [inputs]
+    files = set()
+    for item in inputs:
+        item = os.fspath(item)
+        if os.path.isdir(item):
+            files.update(glob.glob(os.path.join(item, '*.csv')))
+        elif glob.has_magic(item):
+            files.update(glob.glob(item))
+        else:
+            files.add(item)
+    return sorted(files)
+
+# Tracker for one job from a picklable config dict; 'initiation' may hold an 'M/N' window
+def _build_tracker(config, sinks=None):
+    from track_initiation import select_initiation_logic
+    from tracker_core import Tracker
+
+    initiation = select_initiation_logic(config['initiation']) if config.get('initiation') else None
+    return Tracker(config['doppler_threshold'], config['range_threshold'], config['firm_threshold'],
+                   config['time_threshold'], use_doppler_index=config.get('use_doppler_index', False),
+                   sinks=sinks, keep_history=False, initiation=initiation,
+                   merge_tolerances=config.get('merge_tolerances'), merge_every=config.get('merge_every', 1))
+
+# Track one file and stream its events to `output_path`. Runs inside a worker process.
+def run_tracking_job(file_path, output_path, config):
+    from track_sinks import open_sink
+    from tracker_core import load_measurements_from_csv
+
+    start = time.perf_counter()
+    measurements = load_measurements_from_csv(file_path, doppler=config.get('doppler', 'auto'),
+                                              precision=config.get('precision', 'float64'))
+    sink = open_sink(output_path)
+    tracker = _build_tracker(config, sinks=[sink])
+    try:
+        for measurement in measurements:
+            tracker.process(measurement)
+    finally:
+        sink.close()
+
+    live = [track_id for track_id, track in enumerate(tracker.tracks) if track]
+    firm = sum(1 for track_id in live if track_id in tracker.firm_ids)
+    return {
+        'measurements': tracker.processed,
+        'live_tracks': len(live),
+        'firm_tracks': firm,
+        'tentative_tracks': len(live) - firm,
+        'track_ids': len(tracker.track_id_list),
+        'seconds': round(time.perf_counter() - start, 6),
+        'output': output_path,
+    }
+
+# Output path per input file: <stem>.tracks<ext>. Inputs sharing a stem (the same name in
+# different directories) are named after their path relative to their common directory
+# instead, e.g. day1_x.tracks.csv and day2_x.tracks.csv, and any name still taken gets a
+# numeric suffix, so no two jobs write the same file.
+def _output_paths(files, output_dir, extension):
+    stems = {}
+    for file_path in files:
+        stems.setdefault(os.path.splitext(os.path.basename(file_path))[0], []).append(file_path)
+    names = {}
+    derived = set()
+    for stem, group in stems.items():
+        if len(group) == 1:
+            names[group[0]] = stem
+            continue
+        derived.update(group)
+        common = os.path.commonpath([os.path.dirname(os.path.abspath(file_path)) for file_path in group])
+        for file_path in group:
+            relative = os.path.splitext(os.path.relpath(os.path.abspath(file_path), common))[0]
+            names[file_path] = relative.replace(os.sep, '_')
+    paths = {}
+    taken = set()
+    # Plain stems claim their names before the path-derived ones
+    for file_path in [f for f in files if f not in derived] + [f for f in files if f in derived]:
+        name = names[file_path]
+        candidate = name
+        suffix = 2
+        while candidate.lower() in taken:
+            candidate = f"{name}-{suffix}"
+            suffix += 1
+        taken.add(candidate.lower())
+        paths[file_path] = os.path.join(output_dir, f"{candidate}.tracks{extension}")
+    return paths
+
+# Run every input file on `workers` processes and write summary.csv to `output_dir`.
+# Returns the summary rows in input order.
+def run_batch(inputs, output_dir, config, workers=None, extension='.csv'):
+    files = collect_input_files(inputs)
+    os.makedirs(output_dir, exist_ok=True)
+    output_paths = _output_paths(files, output_dir, extension)
+
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_tracking_job, file_path, output_paths[file_path], config): file_path
+                   for file_path in files}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            row = dict.fromkeys(SUMMARY_FIELDS, '')
+            row['file'] = file_path
+            try:
+                row.update(future.result())
+                row['status'] = 'ok'
+            except Exception as e:
+                row['status'] = 'failed'
+                row['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+            rows[file_path] = row
+
+    ordered = [rows[file_path] for file_path in files]
+    with open(os.path.join(output_dir, 'summary.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(ordered)
+    return ordered
+
+# Worker-side handle on the shared measurement columns, attached once per process
+_shared_measurements = None
+
+def _attach_shared_measurements(descriptor):
+    global _shared_measurements
+    from track_shared import SharedMeasurements
+
+    _shared_measurements = SharedMeasurements.attach(descriptor)
+
+def _run_sweep_job(config):
+    start = time.perf_counter()
+    tracker = _build_tracker(config)
+    for measurement in _shared_measurements:
+        tracker.process(measurement)
+    live = [track_id for track_id, track in enumerate(tracker.tracks) if track]
+    firm = sum(1 for track_id in live if track_id in tracker.firm_ids)
+    return {
+        'measurements': tracker.processed,
+        'live_tracks': len(live),
+        'firm_tracks': firm,
+        'tentative_tracks': len(live) - firm,
+        'track_ids': len(tracker.track_id_list),
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+# Run one file under many gate configurations in parallel. The file is loaded once into
+# shared memory and every worker attaches to it instead of receiving a pickled copy.
+# Returns one result dict per config, in config order; failures carry 'error'.
+# precision='float32' halves the shared columns (timestamps stay float64).
+def run_parameter_sweep(file_path, configs, workers=None, precision='float64'):
+    from track_shared import SharedMeasurements
+    from tracker_core import load_measurement_columns
+
+    results = []
+    with SharedMeasurements.create(load_measurement_columns(file_path, precision=precision)) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_measurements,
+                                 initargs=(shared.descriptor,)) as executor:
+            futures = [executor.submit(_run_sweep_job, config) for config in configs]
+            for config, future in zip(configs, futures):
+                result = dict(config)
+                try:
+                    result.update(future.result())
+                    result['status'] = 'ok'
+                except Exception as e:
+                    result['status'] = 'failed'
+                    result['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+                results.append(result)
+    return results
@@ -0,0 +1,333 @@
+import json
+import os
+import struct
+import threading
+
+import numpy as np
+
+from tracker_core import Tracker
+
+# Snapshot layout: magic, format version, length of a JSON header, the JSON header
+# (tracker config, counters and the dtype/shape/offset of each array), then the raw
+# little-endian array bytes. Bump CHECKPOINT_VERSION whenever the layout changes.
+CHECKPOINT_MAGIC = b'TRKCKPT\0'
+# Version 2 added the initiation component, version 3 the initiation pool, version 4
+# the pooled plots' indices, version 5 the track start times and version 6 the clutter
+# map; older snapshots are still readable.
+CHECKPOINT_VERSION = 6
+_READABLE_VERSIONS = (1, 2, 3, 4, 5, 6)
+_PREAMBLE = struct.Struct('<8sHI')
+
+# Optional tracker components saved as their constructor parameters plus state arrays
+_COMPONENTS = {
+    'predictor': (('alpha', 'beta', 'max_speed', 'precision'), ('positions', 'velocities', 'times', 'updates', 'active')),
+    'initiation': (('m', 'n', 'delete_n'), ('history', 'age', 'active', 'firm')),
+}
+
+def _capture_component(component, name):
+    if component is None:
+        return None
+    params, array_names = _COMPONENTS[name]
+    return {
+        'params': {param: getattr(component, param) for param in params},
+        'size': component.size,
+        'arrays': {array: getattr(component, array)[:component.size].copy() for array in array_names},
+    }
+
+# The two-point initiation pool: constructor parameters, counters and the waiting plots
+_POOL_PARAMS = ('max_speed', 'max_age', 'doppler_tolerance', 'range_rate_tolerance')
+_POOL_COUNTERS = ('pooled', 'paired', 'expired')
+
+def _capture_pool(pool):
+    if pool is None:
+        return None
+    return {
+        'params': {param: getattr(pool, param) for param in _POOL_PARAMS},
+        'counters': {counter: getattr(pool, counter) for counter in _POOL_COUNTERS},
+        'pending': pool.pending(),
+    }
+
+def _restore_pool(header, arrays):
+    spec = header.get('initiation_pool')
+    if spec is None:
+        return None
+    from track_pairing import InitiationPool
+
+    pool = InitiationPool(**spec['params'])
+    rows = [tuple(row) for row in arrays['pool_points'].tolist()]
+    for row, extra in spec['extras']:
+        rows[row] = rows[row] + tuple(extra)
+    plot_indices = arrays['pool_plot_indices'].tolist() if 'pool_plot_indices' in arrays else [-1] * len(rows)
+    for measurement, position, plot_index in zip(rows, arrays['pool_positions'].tolist(), plot_indices):
+        pool.add(measurement, position, plot_index)
+    for counter, value in spec['counters'].items():
+        setattr(pool, counter, value)
+    return pool
+
+# The learned clutter map: constructor parameters, counters and the per-cell densities
+# with their last update times
+_CLUTTER_PARAMS = ('range_bin', 'azimuth_bin', 'max_range', 'decay_time', 'threshold', 'mode', 'max_doppler')
+_CLUTTER_COUNTERS = ('observed', 'dropped', 'restricted')
+
+def _capture_clutter(clutter_map):
+    if clutter_map is None:
+        return None
+    return {
+        'params': {param: getattr(clutter_map, param) for param in _CLUTTER_PARAMS},
+        'counters': {counter: getattr(clutter_map, counter) for counter in _CLUTTER_COUNTERS},
+        'density': clutter_map.density.copy(),
+        'updated': clutter_map.updated.copy(),
+    }
+
+def _restore_clutter(header, arrays):
+    spec = header.get('clutter_map')
+    if spec is None:
+        return None
+    from track_clutter import ClutterMap
+
+    clutter_map = ClutterMap(**spec['params'])
+    clutter_map.density[:] = arrays['clutter_density']
+    clutter_map.updated[:] = arrays['clutter_updated']
+    for counter, value in spec['counters'].items():
+        setattr(clutter_map, counter, value)
+    return clutter_map
+
+def _restore_component(name, header, arrays):
+    spec = header.get(name)
+    if spec is None:
+        return None
+    if name == 'predictor':
+        from track_prediction import AlphaBetaPredictor as component_class
+    else:
+        from track_initiation import MofNInitiation as component_class
+    size = spec['size']
+    component = component_class(capacity=max(size, 1), **spec['params'])
+    for array in _COMPONENTS[name][1]:
+        getattr(component, array)[:size] = arrays[f"{name}_{array}"]
+    component.size = size
+    return component
+
+# Copy the complete tracker state. Only containers are copied (measurement tuples are
+# shared), so this is cheap enough to run between two measurements on the ingest thread.
+def capture_state(tracker):
+    state = {
+        'config': {
+            'doppler_threshold': tracker.doppler_threshold,
+            'range_threshold': tracker.range_threshold,
+            'firm_threshold': tracker.firm_threshold,
+            'time_threshold': tracker.time_threshold,
+            'use_doppler_index': tracker.doppler_index is not None,
+            'keep_history': tracker.keep_history,
+            'merge_tolerances': list(tracker.merge_tolerances) if tracker.merge_tolerances is not None else None,
+            'merge_every': tracker.merge_every,
+        },
+        'processed': tracker.processed,
+        'tracks': [list(track) for track in tracker.tracks],
+        'track_id_list': [dict(entry) for entry in tracker.track_id_list],
+        'miss_counts': dict(tracker.miss_counts),
+        'hit_counts': dict(tracker.hit_counts),
+        'start_times': dict(tracker.start_times),
+        'tentative_ids': list(tracker.tentative_ids),
+        'firm_ids': list(tracker.firm_ids),
+    }
+    for name in _COMPONENTS:
+        state[name] = _capture_component(getattr(tracker, name), name)
+    state['initiation_pool'] = _capture_pool(tracker.initiation_pool)
+    state['clutter_map'] = _capture_clutter(tracker.clutter_map)
+    return state
+
+def _int_array(values):
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+# Encode a captured state into the versioned binary snapshot
+def encode_state(state):
+    tracks = state['tracks']
+    lengths = np.array([len(track) for track in tracks], dtype=np.int64)
+    points = np.array([measurement[:5] for track in tracks for measurement in track], dtype=np.float64).reshape(-1, 5)
+    # Anything beyond the five numeric fields (e.g. the sensor ID tag) rides in the header
+    extras = [[row, list(measurement[5:])]
+              for row, measurement in enumerate(m for track in tracks for m in track) if len(measurement) > 5]
+
+    miss_counts = state['miss_counts']
+    hit_counts = state['hit_counts']
+    arrays = {
+        'points': points,
+        'track_lengths': lengths,
+        'id_values': _int_array([entry['id'] for entry in state['track_id_list']]),
+        'id_occupied': np.array([entry['state'] == 'occupied' for entry in state['track_id_list']], dtype=bool),
+        'miss_keys': _int_array(list(miss_counts)),
+        'miss_values': _int_array(list(miss_counts.values())),
+        'hit_keys': _int_array(list(hit_counts)),
+        'hit_values': _int_array(list(hit_counts.values())),
+        'start_keys': _int_array(list(state['start_times'])),
+        'start_values': np.array(list(state['start_times'].values()), dtype=np.float64),
+        'tentative_ids': _int_array(state['tentative_ids']),
+        'firm_ids': _int_array(sorted(state['firm_ids'])),
+    }
+    for name in _COMPONENTS:
+        if state[name] is not None:
+            for array_name, array in state[name]['arrays'].items():
+                arrays[f"{name}_{array_name}"] = array
+    pool = state.get('initiation_pool')
+    if pool is not None:
+        pending = pool['pending']
+        arrays['pool_points'] = np.array([measurement[:5] for measurement, _, _ in pending],
+                                         dtype=np.float64).reshape(-1, 5)
+        arrays['pool_positions'] = np.array([position for _, position, _ in pending], dtype=np.float64).reshape(-1, 3)
+        arrays['pool_plot_indices'] = _int_array([plot_index for _, _, plot_index in pending])
+    clutter = state.get('clutter_map')
+    if clutter is not None:
+        arrays['clutter_density'] = clutter['density']
+        arrays['clutter_updated'] = clutter['updated']
+
+    specs = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+        arrays[name] = array
+        specs.append({'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+        offset += array.nbytes
+
+    header = {
+        'config': state['config'],
+        'processed': state['processed'],
+        'extras': extras,
+        'arrays': specs,
+    }
+    for name in _COMPONENTS:
+        component = state[name]
+        header[name] = None if component is None else {'params': component['params'], 'size': component['size']}
+    if pool is not None:
+        header['initiation_pool'] = {
+            'params': pool['params'],
+            'counters': pool['counters'],
+            'extras': [[row, list(measurement[5:])]
+                       for row, (measurement, _, _) in enumerate(pool['pending']) if len(measurement) > 5],
+        }
+    if clutter is not None:
+        header['clutter_map'] = {'params': clutter['params'], 'counters': clutter['counters']}
+    header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+
+    parts = [_PREAMBLE.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(header)), header]
+    parts.extend(array.tobytes() for array in arrays.values())
+    return b''.join(parts)
+
+# Write bytes next to the target and rename, so a crash never leaves a torn snapshot
+def _write_atomic(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+# Synchronously checkpoint a tracker to `path`
+def write_checkpoint(tracker, path):
+    _write_atomic(path, encode_state(capture_state(tracker)))
+
+# Rebuild a Tracker from snapshot bytes, with identical IDs, counters and track contents
+def decode_tracker(payload):
+    magic, version, header_len = _PREAMBLE.unpack_from(payload, 0)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Not a tracker checkpoint.")
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported checkpoint version {version}, expected {CHECKPOINT_VERSION}.")
+    header_start = _PREAMBLE.size
+    header = json.loads(payload[header_start:header_start + header_len].decode('utf-8'))
+    data_start = header_start + header_len
+
+    arrays = {}
+    for spec in header['arrays']:
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[spec['name']] = np.frombuffer(payload, dtype=dtype, count=count,
+                                             offset=data_start + spec['offset']).reshape(spec['shape'])
+
+    config = header['config']
+    tracker = Tracker(config['doppler_threshold'], config['range_threshold'], config['firm_threshold'],
+                      config['time_threshold'], use_doppler_index=config['use_doppler_index'],
+                      keep_history=config.get('keep_history', True),
+                      merge_tolerances=config.get('merge_tolerances'), merge_every=config.get('merge_every', 1),
+                      predictor=_restore_component('predictor', header, arrays),
+                      initiation=_restore_component('initiation', header, arrays),
+                      initiation_pool=_restore_pool(header, arrays),
+                      clutter_map=_restore_clutter(header, arrays))
+
+    rows = [tuple(row) for row in arrays['points'].tolist()]
+    for row, extra in header['extras']:
+        rows[row] = rows[row] + tuple(extra)
+    tracks = []
+    start = 0
+    for length in arrays['track_lengths'].tolist():
+        tracks.append(rows[start:start + length])
+        start += length
+
+    tracker.tracks = tracks
+    tracker.track_id_list = [{'id': track_id, 'state': 'occupied' if occupied else 'free'}
+                             for track_id, occupied in zip(arrays['id_values'].tolist(),
+                                                           arrays['id_occupied'].tolist())]
+    tracker.miss_counts = dict(zip(arrays['miss_keys'].tolist(), arrays['miss_values'].tolist()))
+    tracker.hit_counts = dict(zip(arrays['hit_keys'].tolist(), arrays['hit_values'].tolist()))
+    if 'start_keys' in arrays:
+        tracker.start_times = dict(zip(arrays['start_keys'].tolist(), arrays['start_values'].tolist()))
+    else:
+        # Older snapshots: the oldest point kept is the best estimate left
+        tracker.start_times = {track_id: track[0][4] for track_id, track in enumerate(tracks) if track}
+    tracker.tentative_ids = dict.fromkeys(arrays['tentative_ids'].tolist(), True)
+    tracker.firm_ids = set(arrays['firm_ids'].tolist())
+    tracker.processed = header['processed']
+
+    if tracker.doppler_index is not None:
+        for track_id, track in enumerate(tracks):
+            if track:
+                tracker.doppler_index.update(track_id, track[-1][3])
+
+    return tracker
+
+# Restore a Tracker from a checkpoint file
+def restore_tracker(path):
+    with open(path, 'rb') as f:
+        return decode_tracker(f.read())
+
+# Periodic checkpointing that does not pause ingest: call tick() after each processed
+# measurement. Every `every` measurements the state is captured on the calling thread and
+# encoded/written on a background thread. If the previous write is still running the
+# checkpoint is skipped rather than waited for: it counts once in `skipped` and the next
+# attempt comes a full period later.
+class PeriodicCheckpointer:
+    def __init__(self, tracker, path, every=10000):
+        self.tracker = tracker
+        self.path = path
+        self.every = every
+        self.written = 0
+        self.skipped = 0
+        self.last_error = None
+        self._since_last = 0
+        self._thread = None
+
+    def _write(self, state):
+        try:
+            _write_atomic(self.path, encode_state(state))
+            self.written += 1
+        except Exception as e:
+            self.last_error = e
+
+    def checkpoint(self):
+        self._since_last = 0
+        if self._thread is not None and self._thread.is_alive():
+            self.skipped += 1
+            return False
+        self._thread = threading.Thread(target=self._write, args=(capture_state(self.tracker),), daemon=True)
+        self._thread.start()
+        return True
+
+    def tick(self):
+        self._since_last += 1
+        if self._since_last >= self.every:
+            self.checkpoint()
+
+    # Wait for an in-flight write, optionally taking a final checkpoint first
+    def close(self, final=True):
+        if self._thread is not None:
+            self._thread.join()
+        if final:
+            self._thread = None
+            self._write(capture_state(self.tracker))
@@ -0,0 +1,155 @@
+import argparse
+import sys
+
+# Command-line entry point for the headless tracker. Heavy modules (NumPy, pandas and the
+# tracking core) are imported inside the command handlers, so `--help` and argument
+# errors return without loading them.
+
+def _add_gate_arguments(parser):
+    parser.add_argument('--doppler-threshold', type=float, default=2.0, help='doppler gate threshold')
+    parser.add_argument('--range-threshold', type=float, default=10.0,
+                        help='range gate threshold in Cartesian distance')
+    parser.add_argument('--time-threshold', type=float, default=2.0, help='time window threshold in seconds')
+    parser.add_argument('--mode', default='3-state', choices=['3-state', '5-state', '7-state'],
+                        help='initiation mode')
+    parser.add_argument('--initiation', metavar='M/N',
+                        help='confirm tracks with M hits out of the last N instead of --mode')
+    parser.add_argument('--doppler', default='auto', choices=['auto', 'measured', 'derived'],
+                        help="doppler source: the file's doppler column if present, else per-track range rate "
+                             "(auto); the column only (measured); or the legacy row-to-row difference (derived)")
+    parser.add_argument('--precision', default='float64', choices=['float64', 'float32'],
+                        help='precision of loaded positions, angles and dopplers; timestamps stay float64')
+    parser.add_argument('--merge-distance', type=float, metavar='DISTANCE',
+                        help='merge tracks whose tails are closer than this (with doppler and time within '
+                             'their gate thresholds) every --merge-every measurements')
+    parser.add_argument('--merge-every', type=int, default=1, metavar='N',
+                        help='measurements between duplicate merge passes (default: 1)')
+
+# (position, doppler, time) tolerances for the periodic duplicate merge, or None
+def _merge_tolerances(args):
+    if args.merge_distance is None:
+        return None
+    return (args.merge_distance, args.doppler_threshold, args.time_threshold)
+
+def _print_summary(tracker):
+    tracks, track_id_list, miss_counts, hit_counts, firm_ids = tracker.result()
+    live = [track_id for track_id, track in enumerate(tracks) if track]
+    firm = sum(1 for track_id in live if track_id in firm_ids)
+    print(f"Processed {tracker.processed} measurements: {len(live)} live tracks "
+          f"({firm} firm, {len(live) - firm} tentative), {len(track_id_list)} track IDs allocated.")
+
+def run_command(args):
+    from track_sinks import open_sink
+    from track_initiation import select_initiation_logic
+    from tracker_core import Tracker, load_measurements_from_csv, select_initiation_mode
+
+    initiation = select_initiation_logic(args.initiation) if args.initiation else None
+    initiation_pool = None
+    if args.pair_speed is not None:
+        from track_pairing import InitiationPool
+
+        initiation_pool = InitiationPool(args.pair_speed, args.time_threshold,
+                                         doppler_tolerance=args.doppler_threshold)
+    sinks = [open_sink(args.output)] if args.output else []
+    tracker = Tracker(args.doppler_threshold, args.range_threshold, select_initiation_mode(args.mode),
+                      args.time_threshold, use_doppler_index=args.doppler_index, sinks=sinks,
+                      keep_history=not sinks, initiation=initiation, initiation_pool=initiation_pool,
+                      merge_tolerances=_merge_tolerances(args), merge_every=args.merge_every)
+    metrics_server = None
+    if args.metrics_port is not None:
+        from track_metrics import MetricsServer, TrackerMetrics
+
+        tracker.metrics = TrackerMetrics(tracker)
+        metrics_server = MetricsServer(tracker.metrics, port=args.metrics_port)
+        print(f"Serving metrics on http://{metrics_server.host}:{metrics_server.port}/metrics")
+    try:
+        if args.pipeline:
+            from track_pipeline import run_pipeline
+
+            run_pipeline(args.file, tracker, doppler=args.doppler, precision=args.precision)
+        else:
+            for measurement in load_measurements_from_csv(args.file, doppler=args.doppler, precision=args.precision):
+                tracker.process(measurement)
+    finally:
+        for sink in sinks:
+            sink.close()
+        if metrics_server is not None:
+            metrics_server.close()
+    _print_summary(tracker)
+    return 0
+
+def replay_command(args):
+    import track_replay
+
+    argv = [args.file, '--speed', str(args.speed)] + args.replay_args
+    track_replay.main(argv)
+    return 0
+
+def batch_command(args):
+    from track_batch import run_batch
+    from tracker_core import select_initiation_mode
+
+    config = {
+        'doppler_threshold': args.doppler_threshold,
+        'range_threshold': args.range_threshold,
+        'firm_threshold': select_initiation_mode(args.mode),
+        'time_threshold': args.time_threshold,
+        'use_doppler_index': args.doppler_index,
+        'initiation': args.initiation,
+        'doppler': args.doppler,
+        'precision': args.precision,
+        'merge_tolerances': _merge_tolerances(args),
+        'merge_every': args.merge_every,
+    }
+    rows = run_batch(args.inputs, args.output_dir, config, workers=args.workers, extension=args.format)
+    failed = [row for row in rows if row['status'] != 'ok']
+    print(f"Processed {len(rows) - len(failed)} of {len(rows)} files; summary written to "
+          f"{args.output_dir}/summary.csv.")
+    for row in failed:
+        print(f"  FAILED {row['file']}: {row['error']}")
+    return 1 if failed else 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='track_cli.py', description='Headless track initialization.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='track one measurement file')
+    run_parser.add_argument('file', help='measurement CSV file')
+    _add_gate_arguments(run_parser)
+    run_parser.add_argument('--doppler-index', action='store_true', help='pre-gate tracks by doppler bins')
+    run_parser.add_argument('--output', help='stream track events to a .csv, .jsonl or .bin file')
+    run_parser.add_argument('--pair-speed', type=float, metavar='MAX_SPEED',
+                            help='start tracks only from plot pairs within --time-threshold implying at most '
+                                 'this speed')
+    run_parser.add_argument('--pipeline', action='store_true',
+                            help='parse, convert, associate and write on separate threads')
+    run_parser.add_argument('--metrics-port', type=int,
+                            help='serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run')
+    run_parser.set_defaults(handler=run_command)
+
+    replay_parser = subparsers.add_parser('replay', help='replay a recording at its own pace')
+    replay_parser.add_argument('file', help='measurement CSV file')
+    replay_parser.add_argument('--speed', type=float, default=1.0,
+                               help='multiple of real time; 0 replays as fast as possible')
+    replay_parser.add_argument('replay_args', nargs=argparse.REMAINDER,
+                               help='further options passed to track_replay.py')
+    replay_parser.set_defaults(handler=replay_command)
+
+    batch_parser = subparsers.add_parser('batch', help='track many files on a process pool')
+    batch_parser.add_argument('inputs', nargs='+', help='measurement files, directories or glob patterns')
+    batch_parser.add_argument('--output-dir', required=True, help='directory for per-file results and summary.csv')
+    batch_parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    batch_parser.add_argument('--format', default='.csv', choices=['.csv', '.jsonl', '.bin'],
+                              help='format of the per-file event output')
+    _add_gate_arguments(batch_parser)
+    batch_parser.add_argument('--doppler-index', action='store_true', help='pre-gate tracks by doppler bins')
+    batch_parser.set_defaults(handler=batch_command)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
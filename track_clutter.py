@@ -0,0 +1,84 @@
+import numpy as np
+
+# Learned static clutter map over range/azimuth cells. Every plot adds one to its cell;
+# cell densities decay exponentially with time constant `decay_time` (seconds of
+# measurement time), so a cell that keeps producing plots settles near rate * decay_time
+# while transient targets fade. Decay is applied lazily per cell when it is touched.
+# Plots landing in a cell whose density has reached `threshold` are suppressed:
+# mode='drop' discards them before association, mode='restrict' lets them update
+# existing tracks but not initiate new ones. With `max_doppler` set only plots with
+# |doppler| below it are treated as potential clutter; a plot whose doppler is unknown
+# (NaN) or not finite skips that check and is judged on density alone.
+class ClutterMap:
+    def __init__(self, range_bin, azimuth_bin, max_range, decay_time=60.0, threshold=5.0, mode='drop',
+                 max_doppler=None):
+        if mode not in ('drop', 'restrict'):
+            raise ValueError("Invalid clutter mode. Choose 'drop' or 'restrict'.")
+        self.range_bin = range_bin
+        self.azimuth_bin = azimuth_bin
+        self.max_range = max_range
+        self.decay_time = decay_time
+        self.threshold = threshold
+        self.mode = mode
+        self.max_doppler = max_doppler
+        self.n_range = int(np.ceil(max_range / range_bin))
+        self.n_azimuth = int(np.ceil(360.0 / azimuth_bin))
+        self.density = np.zeros((self.n_range, self.n_azimuth))
+        self.updated = np.zeros((self.n_range, self.n_azimuth))
+        self.observed = 0
+        self.dropped = 0
+        self.restricted = 0
+
+    # Cell indices for azimuth/range values (scalars or arrays); ranges past max_range
+    # fall in the outermost ring
+    def cell(self, az, r):
+        range_idx = np.clip((np.asarray(r, dtype=np.float64) // self.range_bin).astype(np.intp), 0, self.n_range - 1)
+        az_idx = ((np.mod(np.asarray(az, dtype=np.float64), 360.0) // self.azimuth_bin).astype(np.intp)
+                  % self.n_azimuth)
+        return range_idx, az_idx
+
+    # Decayed density of the given cells at time t, without updating them
+    def density_at(self, range_idx, az_idx, t):
+        elapsed = np.maximum(t - self.updated[range_idx, az_idx], 0.0)
+        return self.density[range_idx, az_idx] * np.exp(-elapsed / self.decay_time)
+
+    def _observe_cell(self, range_idx, az_idx, t):
+        elapsed = max(t - self.updated[range_idx, az_idx], 0.0)
+        self.density[range_idx, az_idx] = self.density[range_idx, az_idx] * np.exp(-elapsed / self.decay_time) + 1.0
+        self.updated[range_idx, az_idx] = max(t, self.updated[range_idx, az_idx])
+        self.observed += 1
+
+    # Learn from one measurement and decide what to do with it: 'pass', 'drop' or
+    # 'restrict'. The density is judged before the plot itself is added.
+    def classify(self, measurement):
+        az, r, doppler, t = measurement[0], measurement[2], measurement[3], measurement[4]
+        range_idx, az_idx = self.cell(az, r)
+        range_idx = int(range_idx)
+        az_idx = int(az_idx)
+        density = float(self.density_at(range_idx, az_idx, t))
+        self._observe_cell(range_idx, az_idx, t)
+        if density < self.threshold:
+            return 'pass'
+        if self.max_doppler is not None and np.isfinite(doppler) and not abs(doppler) < self.max_doppler:
+            return 'pass'
+        if self.mode == 'drop':
+            self.dropped += 1
+            return 'drop'
+        self.restricted += 1
+        return 'restrict'
+
+    # Boolean (n_range, n_azimuth) mask of cells currently at or above the threshold
+    def clutter_cells(self, t):
+        elapsed = np.maximum(t - self.updated, 0.0)
+        return self.density * np.exp(-elapsed / self.decay_time) >= self.threshold
+
+    def stats(self, t=None):
+        stats = {
+            'observed': self.observed,
+            'dropped': self.dropped,
+            'restricted': self.restricted,
+            'suppressed_fraction': (self.dropped + self.restricted) / self.observed if self.observed else 0.0,
+        }
+        if t is not None:
+            stats['clutter_cells'] = int(self.clutter_cells(t).sum())
+        return stats
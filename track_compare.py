@@ -0,0 +1,315 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from tracker_core import Tracker, load_measurements_from_csv
+
+# Differential harness for tracker engines. The reference engine is BaselineTracker, a
+# frozen copy of the original tracking loop; a candidate is any factory config -> tracker
+# with the same process()/result() interface. Both run on identical measurements, the
+# per-plot track ID sequence and the final tracks, ID pool and firm/tentative outcome are
+# diffed, and wall time and peak traced memory are reported side by side. A comparison
+# in which the reference confirms no track proves little and is reported as vacuous.
+# New engines register themselves in ENGINES.
+
+# Raised by BaselineTracker at the first plot that would reuse a released track ID
+class BaselineDiverged(Exception):
+    pass
+
+# The original initialize_tracks loop (test5.py), one measurement per process() call.
+# Frozen: do not optimize or fix it. It differs from Tracker on purpose in one place. When
+# a new track reuses a released ID, the original appends the track but keeps its counters
+# under that ID's slot. tracks and IDs then drift apart and a later deletion raises
+# IndexError. Tracker puts the track in the freed slot instead (see tracker_core). The
+# baseline therefore stops with BaselineDiverged at the first ID reuse, and engines are
+# compared on the plots before it.
+class BaselineTracker:
+    def __init__(self, doppler_threshold, range_threshold, firm_threshold, time_threshold):
+        self.doppler_threshold = doppler_threshold
+        self.range_threshold = range_threshold
+        self.firm_threshold = firm_threshold
+        self.time_threshold = time_threshold
+        self.tracks = []
+        self.track_id_list = []
+        self.miss_counts = {}
+        self.hit_counts = {}
+        self.tentative_ids = {}
+        self.firm_ids = set()
+
+    @staticmethod
+    def _sph2cart(az, el, r):
+        az = np.radians(az)
+        el = np.radians(el)
+        return r * np.cos(el) * np.cos(az), r * np.cos(el) * np.sin(az), r * np.sin(el)
+
+    def process(self, measurement):
+        tracks = self.tracks
+        miss_counts = self.miss_counts
+        hit_counts = self.hit_counts
+        firm_ids = self.firm_ids
+        measurement_cartesian = self._sph2cart(measurement[0], measurement[1], measurement[2])
+        measurement_doppler = measurement[3]
+        measurement_time = measurement[4]
+
+        assigned = False
+        target_id = None
+        for track_id, track in enumerate(tracks):
+            if not track:
+                continue
+
+            last_measurement = track[-1]
+            last_cartesian = self._sph2cart(last_measurement[0], last_measurement[1], last_measurement[2])
+            last_doppler = last_measurement[3]
+            last_time = last_measurement[4]
+
+            distance = np.linalg.norm(np.array(measurement_cartesian) - np.array(last_cartesian))
+            doppler_correlated = abs(measurement_doppler - last_doppler) < self.doppler_threshold
+            range_satisfied = distance < self.range_threshold
+            time_diff = measurement_time - last_time
+
+            if doppler_correlated and range_satisfied and time_diff <= self.time_threshold:
+                if track_id not in firm_ids:
+                    if track_id in self.tentative_ids:
+                        hit_counts[track_id] += 1
+                        miss_counts[track_id] = 0
+                        if hit_counts[track_id] >= self.firm_threshold:
+                            firm_ids.add(track_id)
+                    else:
+                        self.tentative_ids[track_id] = True
+                        hit_counts[track_id] = 1
+                        miss_counts[track_id] = 0
+                tracks[track_id].append(measurement)
+                assigned = True
+                target_id = track_id
+                break
+
+        if not assigned:
+            new_track_idx = next((idx for idx, entry in enumerate(self.track_id_list) if entry['state'] == 'free'),
+                                 len(self.track_id_list))
+            if new_track_idx < len(self.track_id_list):
+                raise BaselineDiverged(f"plot reuses track ID {self.track_id_list[new_track_idx]['id']}")
+            self.track_id_list.append({'id': new_track_idx + 1, 'state': 'occupied'})
+            tracks.append([measurement])
+            miss_counts[new_track_idx] = 0
+            hit_counts[new_track_idx] = 1
+            self.tentative_ids[new_track_idx] = True
+            target_id = len(tracks) - 1
+
+        for track_id in range(len(tracks)):
+            if track_id not in firm_ids and not assigned:
+                if track_id in miss_counts:
+                    miss_counts[track_id] += 1
+                    if miss_counts[track_id] > self.firm_threshold:
+                        tracks[track_id] = []
+                        self.track_id_list[track_id]['state'] = 'free'
+        return target_id
+
+    def result(self):
+        return self.tracks, self.track_id_list, self.miss_counts, self.hit_counts, self.firm_ids
+
+def _baseline_engine(config):
+    return BaselineTracker(config['doppler_threshold'], config['range_threshold'], config['firm_threshold'],
+                           config['time_threshold'])
+
+def _tracker_engine(config):
+    return Tracker(config['doppler_threshold'], config['range_threshold'], config['firm_threshold'],
+                   config['time_threshold'])
+
+def _doppler_index_engine(config):
+    return Tracker(config['doppler_threshold'], config['range_threshold'], config['firm_threshold'],
+                   config['time_threshold'], use_doppler_index=True)
+
+ENGINES = {
+    'baseline': _baseline_engine,
+    'tracker': _tracker_engine,
+    'doppler-index': _doppler_index_engine,
+}
+
+# range_threshold covers a target's largest move in one scan (about 45 m at 30 m/s per axis)
+DEFAULT_CONFIG = {'doppler_threshold': 2.0, 'range_threshold': 60.0, 'firm_threshold': 3, 'time_threshold': 2.0}
+
+# Synthetic scan data: `targets` constant-velocity targets seen once per scan with small
+# noise, plus `clutter` uniformly random plots per scan. Doppler is the true range rate.
+# Every unassigned plot counts as a miss for every tentative track, so a scan with more
+# than firm_threshold new plots deletes tracks before they can confirm. The defaults keep
+# every target firm under DEFAULT_CONFIG and never release an ID, so the baseline runs to
+# the end; add clutter (with --reference tracker) to exercise deletion and ID reuse.
+def generate_scenario(targets=3, scans=50, clutter=0, scan_period=1.0, noise=0.5, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-2000.0, 2000.0, size=(targets, 3))
+    positions[:, 2] = rng.uniform(100.0, 3000.0, size=targets)
+    velocities = rng.uniform(-30.0, 30.0, size=(targets, 3))
+    velocities[:, 2] = rng.uniform(-2.0, 2.0, size=targets)
+    measurements = []
+    for scan in range(scans):
+        t0 = scan * scan_period
+        points = positions + velocities * t0 + rng.normal(0.0, noise, size=positions.shape)
+        ranges = np.linalg.norm(points, axis=1)
+        range_rates = np.einsum('ij,ij->i', points, velocities) / ranges
+        azimuths = np.degrees(np.arctan2(points[:, 1], points[:, 0])) % 360.0
+        elevations = np.degrees(np.arcsin(points[:, 2] / ranges))
+        rows = list(zip(azimuths, elevations, ranges, range_rates))
+        rows += list(zip(rng.uniform(0.0, 360.0, clutter), rng.uniform(0.0, 30.0, clutter),
+                         rng.uniform(100.0, 4000.0, clutter), rng.uniform(-30.0, 30.0, clutter)))
+        order = rng.permutation(len(rows))
+        step = scan_period / (len(rows) + 1)
+        for k, idx in enumerate(order):
+            az, el, r, doppler = rows[idx]
+            measurements.append((float(az), float(el), float(r), float(doppler), t0 + (k + 1) * step))
+    return measurements
+
+# Run one engine over the measurements. Returns the per-plot track IDs (0 where a plot
+# was dropped), the number of initiations that reused a released ID, the final result and
+# the number of plots processed (fewer than given when the baseline diverges).
+# Engines keep full history, so a one-point track after process() is a fresh initiation.
+def _run(factory, config, measurements):
+    tracker = factory(config)
+    assignments = np.zeros(len(measurements), dtype=np.int64)
+    reused = 0
+    for idx, measurement in enumerate(measurements):
+        allocated = len(tracker.track_id_list)
+        try:
+            slot = tracker.process(measurement)
+        except BaselineDiverged:
+            return assignments[:idx], reused, tracker.result(), idx
+        if slot is None:
+            continue
+        assignments[idx] = tracker.track_id_list[slot]['id']
+        if len(tracker.tracks[slot]) == 1 and len(tracker.track_id_list) == allocated:
+            reused += 1
+    return assignments, reused, tracker.result(), len(measurements)
+
+def _outcome(result):
+    tracks, track_id_list, miss_counts, hit_counts, firm_ids = result
+    live = {slot for slot, track in enumerate(tracks) if track}
+    return {
+        'tracks': [list(map(tuple, track)) for track in tracks],
+        'id_states': [entry['state'] for entry in track_id_list],
+        'firm': sorted(live & set(firm_ids)),
+        'tentative': sorted(live - set(firm_ids)),
+        'hit_counts': {slot: hit_counts[slot] for slot in live if slot in hit_counts},
+        'miss_counts': {slot: miss_counts[slot] for slot in live if slot in miss_counts},
+    }
+
+# Best-of-`repeat` wall time and peak traced memory of one engine
+def _measure(factory, config, measurements, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        _run(factory, config, measurements)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _run(factory, config, measurements)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+# Compare `candidate` against `reference` (engine names or factories) on one input.
+# When the baseline (on either side) stops at an ID reuse both engines are compared on
+# the plots before it.
+# Returns a dict with the differences found and the speedup and memory ratio.
+def compare_engines(measurements, candidate, reference='baseline', config=None, repeat=3):
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    ref_factory = ENGINES[reference] if isinstance(reference, str) else reference
+    cand_factory = ENGINES[candidate] if isinstance(candidate, str) else candidate
+
+    total = len(measurements)
+    ref_assign, ref_reused, ref_result, compared = _run(ref_factory, config, measurements)
+    cand_assign, cand_reused, cand_result, cand_compared = _run(cand_factory, config, measurements[:compared])
+    if cand_compared < compared:
+        compared = cand_compared
+        ref_assign, ref_reused, ref_result, _ = _run(ref_factory, config, measurements[:compared])
+    measurements = measurements[:compared]
+    ref_outcome = _outcome(ref_result)
+    cand_outcome = _outcome(cand_result)
+
+    mismatched = np.flatnonzero(ref_assign != cand_assign)
+    differences = [key for key in ref_outcome if ref_outcome[key] != cand_outcome[key]]
+    if ref_reused != cand_reused:
+        differences.append('id_reuse')
+    if len(mismatched):
+        differences.insert(0, 'assignments')
+
+    ref_time, ref_peak = _measure(ref_factory, config, measurements, repeat)
+    cand_time, cand_peak = _measure(cand_factory, config, measurements, repeat)
+    return {
+        'measurements': total,
+        'compared': compared,
+        'equivalent': not differences,
+        'vacuous': not ref_outcome['firm'],
+        'differences': differences,
+        'mismatched_plots': len(mismatched),
+        'first_mismatch': int(mismatched[0]) if len(mismatched) else None,
+        'id_reuse': (ref_reused, cand_reused),
+        'firm': (len(ref_outcome['firm']), len(cand_outcome['firm'])),
+        'tentative': (len(ref_outcome['tentative']), len(cand_outcome['tentative'])),
+        'seconds': (ref_time, cand_time),
+        'speedup': ref_time / cand_time if cand_time else float('inf'),
+        'peak_bytes': (ref_peak, cand_peak),
+        'memory_ratio': cand_peak / ref_peak if ref_peak else float('nan'),
+    }
+
+def format_report(name, report):
+    if not report['equivalent']:
+        status = 'DIFFERS (' + ', '.join(report['differences']) + ')'
+    elif report['vacuous']:
+        status = 'VACUOUS'
+    else:
+        status = 'same'
+    plots = f"{report['compared']}/{report['measurements']}"
+    line = (f"{name:<32} {plots:>11} {status:<12} "
+            f"{report['speedup']:>7.2f}x {report['memory_ratio']:>7.2f}x  "
+            f"firm {report['firm'][0]}/{report['firm'][1]}  tentative {report['tentative'][0]}/{report['tentative'][1]}  "
+            f"reused IDs {report['id_reuse'][0]}/{report['id_reuse'][1]}")
+    if report['first_mismatch'] is not None:
+        line += f"\n{'':<32} {report['mismatched_plots']} plots assigned differently, first at plot {report['first_mismatch']}"
+    if report['vacuous']:
+        line += f"\n{'':<32} the reference confirmed no track, so the comparison proves little"
+    return line
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff tracker engines against the reference and time them.')
+    parser.add_argument('files', nargs='*', default=['file.csv', 'measurements.csv'], help='measurement CSV files')
+    parser.add_argument('--reference', default='baseline', choices=sorted(ENGINES),
+                        help="reference engine ('tracker' compares whole runs past the first ID reuse)")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                        help='candidate engines (default: all but the reference)')
+    parser.add_argument('--doppler', default='derived', choices=['auto', 'measured', 'derived'],
+                        help="doppler source for the CSV files (see tracker_core.doppler_column)")
+    parser.add_argument('--scenarios', type=int, default=2, help='number of generated scenarios')
+    parser.add_argument('--targets', type=int, default=3)
+    parser.add_argument('--scans', type=int, default=50)
+    parser.add_argument('--clutter', type=int, default=0, help='clutter plots per scan')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is kept)')
+    parser.add_argument('--doppler-threshold', type=float, default=DEFAULT_CONFIG['doppler_threshold'])
+    parser.add_argument('--range-threshold', type=float, default=DEFAULT_CONFIG['range_threshold'])
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_CONFIG['time_threshold'])
+    parser.add_argument('--firm-threshold', type=int, default=DEFAULT_CONFIG['firm_threshold'])
+    args = parser.parse_args(argv)
+
+    config = {'doppler_threshold': args.doppler_threshold, 'range_threshold': args.range_threshold,
+              'firm_threshold': args.firm_threshold, 'time_threshold': args.time_threshold}
+    engines = args.engines or [name for name in ENGINES if name != args.reference]
+    inputs = [(file_path, load_measurements_from_csv(file_path, doppler=args.doppler)) for file_path in args.files]
+    inputs += [(f"scenario-{seed}", generate_scenario(args.targets, args.scans, args.clutter, seed=seed))
+               for seed in range(args.scenarios)]
+
+    all_equivalent = True
+    print(f"{'input / engine':<32} {'plots':>11} {'result':<12} {'speedup':>8} {'memory':>8}")
+    for name, measurements in inputs:
+        for engine in engines:
+            report = compare_engines(measurements, engine, reference=args.reference, config=config,
+                                     repeat=args.repeat)
+            all_equivalent &= report['equivalent']
+            print(format_report(f"{name} [{engine}]", report))
+    return 0 if all_equivalent else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+import numpy as np
+
+MAX_WINDOW = 64
+
+# Set bits of every element of an unsigned integer array
+if hasattr(np, 'bitwise_count'):
+    def _popcount(values):
+        return np.bitwise_count(values).astype(np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+    def _popcount(values):
+        as_bytes = values.view(np.uint8).reshape(values.shape + (values.dtype.itemsize,))
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=-1)
+
+# Configurable M-of-N track initiation. Each track's hit/miss history is a bitmask in a
+# uint64 array (bit 0 = latest opportunity, 1 = hit), indexed by track position. A track
+# is confirmed once it has `m` hits among its last `n` opportunities, and a tentative
+# track is deleted once its last `delete_n` opportunities were all misses.
+# An opportunity follows the Tracker's existing rules: a hit when a measurement is
+# associated with the track, a miss for every tentative track when a measurement
+# starts a new one.
+class MofNInitiation:
+    def __init__(self, m, n, delete_n=None, capacity=64):
+        if not 1 <= m <= n <= MAX_WINDOW:
+            raise ValueError(f"Invalid M-of-N window {m}/{n}: need 1 <= M <= N <= {MAX_WINDOW}.")
+        delete_n = m + 1 if delete_n is None else delete_n
+        if not 1 <= delete_n <= MAX_WINDOW:
+            raise ValueError(f"Invalid deletion window {delete_n}: need 1 <= delete_n <= {MAX_WINDOW}.")
+        self.m = m
+        self.n = n
+        self.delete_n = delete_n
+        self.confirm_mask = np.uint64((1 << n) - 1)
+        self.delete_mask = np.uint64((1 << delete_n) - 1)
+        self.history = np.zeros(capacity, dtype=np.uint64)
+        self.age = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.firm = np.zeros(capacity, dtype=bool)
+        self.size = 0
+
+    def _ensure_capacity(self, track_id):
+        capacity = len(self.history)
+        if track_id < capacity:
+            return
+        while capacity <= track_id:
+            capacity *= 2
+        extra = capacity - len(self.history)
+        self.history = np.concatenate([self.history, np.zeros(extra, dtype=np.uint64)])
+        self.age = np.concatenate([self.age, np.zeros(extra, dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+        self.firm = np.concatenate([self.firm, np.zeros(extra, dtype=bool)])
+
+    # A new track starts with one hit
+    def start(self, track_id):
+        self._ensure_capacity(track_id)
+        self.history[track_id] = 1
+        self.age[track_id] = 1
+        self.active[track_id] = True
+        self.firm[track_id] = False
+        self.size = max(self.size, track_id + 1)
+
+    # Record a hit; returns True when it confirms the track
+    def hit(self, track_id):
+        if self.firm[track_id]:
+            return False
+        history = (int(self.history[track_id]) << 1 | 1) & 0xFFFFFFFFFFFFFFFF
+        self.history[track_id] = history
+        self.age[track_id] += 1
+        if (history & int(self.confirm_mask)).bit_count() >= self.m:
+            self.firm[track_id] = True
+            return True
+        return False
+
+    # Record a miss for every live tentative track except `exclude` and return the
+    # positions of those that now fail the deletion rule, all in vectorized steps
+    def miss_all(self, exclude=None):
+        n = self.size
+        tentative = self.active[:n] & ~self.firm[:n]
+        if exclude is not None and exclude < n:
+            tentative[exclude] = False
+        self.history[:n][tentative] <<= np.uint64(1)
+        self.age[:n][tentative] += 1
+        stale = tentative & (self.age[:n] >= self.delete_n) & ((self.history[:n] & self.delete_mask) == 0)
+        deleted = np.flatnonzero(stale)
+        self.active[deleted] = False
+        return deleted.tolist()
+
+    def remove(self, track_id):
+        if track_id < self.size:
+            self.active[track_id] = False
+
+    # Hits within the confirmation window for each track, as one popcount over the array
+    def hit_counts(self):
+        return _popcount(self.history[:self.size] & self.confirm_mask)
+
+    # Consecutive misses since the latest hit for each track: the trailing zero count,
+    # taken as the popcount of (lowest set bit - 1)
+    def miss_counts(self):
+        history = self.history[:self.size]
+        with np.errstate(over='ignore'):
+            lowest = history & (~history + np.uint64(1))
+            trailing = _popcount(lowest - np.uint64(1))
+        return np.minimum(trailing, self.age[:self.size])
+
+    def hits(self, track_id):
+        return (int(self.history[track_id]) & int(self.confirm_mask)).bit_count()
+
+    def misses(self, track_id):
+        history = int(self.history[track_id])
+        if history == 0:
+            return min(int(self.age[track_id]), MAX_WINDOW)
+        return (history & -history).bit_length() - 1
+
+# Build the initiation logic for a mode string: the legacy '3-state', '5-state' and
+# '7-state' modes become 3-of-3, 5-of-5 and 7-of-7, and 'M/N' selects M hits out of N.
+def select_initiation_logic(mode):
+    if mode in ('3-state', '5-state', '7-state'):
+        k = int(mode.split('-')[0])
+        return MofNInitiation(k, k)
+    try:
+        m, n = (int(part) for part in mode.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid initiation mode '{mode}'. Choose '3-state', '5-state', '7-state' or 'M/N'.")
+    return MofNInitiation(m, n)
@@ -0,0 +1,180 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Live metrics for a streaming tracker. Latencies go into log-bucketed histograms: bucket
+# k covers [min_value * 10**(k / buckets_per_decade), min_value * 10**((k + 1) / buckets_per_decade)),
+# so recording a value is one log10 and one array increment and percentiles are accurate
+# to the bucket width (about 26% with the default 10 buckets per decade). Gauges for queue
+# depth, tracks by state and track ID pool occupancy are read from the tracker when the
+# metrics are rendered. MetricsServer serves them in Prometheus text format over HTTP.
+# A histogram's buckets, count and sum change together under its lock, so a scrape on the
+# server thread always sees them consistent with each other.
+
+class LogHistogram:
+    def __init__(self, min_value=1e-7, buckets_per_decade=10, decades=8):
+        self.min_value = min_value
+        self.buckets_per_decade = buckets_per_decade
+        self.size = buckets_per_decade * decades
+        # One underflow bucket at the front and one overflow bucket at the end
+        self.counts = np.zeros(self.size + 2, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self._log_min = math.log10(min_value)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if value < self.min_value:
+            idx = 0
+        else:
+            idx = min(int((math.log10(value) - self._log_min) * self.buckets_per_decade) + 1, self.size + 1)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += value
+
+    # Copies of (counts, count, total) taken together
+    def snapshot(self):
+        with self._lock:
+            return self.counts.copy(), self.count, self.total
+
+    # Upper edge of bucket k (the underflow bucket ends at min_value)
+    def upper_bound(self, idx):
+        if idx > self.size:
+            return float('inf')
+        return self.min_value * 10.0 ** (idx / self.buckets_per_decade)
+
+    # Upper edge of the bucket holding the q-quantile; nan before the first observation
+    def quantile(self, q, counts=None):
+        if counts is None:
+            counts = self.snapshot()[0]
+        total = int(counts.sum())
+        if not total:
+            return float('nan')
+        idx = int(np.searchsorted(np.cumsum(counts), math.ceil(q * total)))
+        return self.upper_bound(idx)
+
+    def percentiles(self):
+        counts = self.snapshot()[0]
+        return {'p50': self.quantile(0.5, counts), 'p99': self.quantile(0.99, counts),
+                'p999': self.quantile(0.999, counts)}
+
+class TrackerMetrics:
+    QUANTILES = (0.5, 0.99, 0.999)
+
+    def __init__(self, tracker=None, queue_depth=None, **histogram_options):
+        self.tracker = tracker
+        # Callable returning the current number of measurements waiting upstream of the tracker
+        self.queue_depth = queue_depth
+        self.processing = LogHistogram(**histogram_options)
+        self.end_to_end = LogHistogram(**histogram_options)
+
+    def observe_processing(self, seconds):
+        self.processing.observe(seconds)
+
+    # Time from a measurement's arrival (or scheduled arrival) to the end of its processing
+    def observe_end_to_end(self, seconds):
+        self.end_to_end.observe(seconds)
+
+    # Counts of live tracks by state and of track IDs by pool state
+    def track_counts(self):
+        tracker = self.tracker
+        tracks = list(tracker.tracks)
+        firm_ids = set(tracker.firm_ids)
+        live = [slot for slot, track in enumerate(tracks) if track]
+        firm = sum(1 for slot in live if slot in firm_ids)
+        states = [entry['state'] for entry in list(tracker.track_id_list)]
+        occupied = states.count('occupied')
+        return {
+            'tentative': len(live) - firm,
+            'firm': firm,
+            'ids_occupied': occupied,
+            'ids_free': len(states) - occupied,
+        }
+
+    def _histogram_lines(self, name, help_text, histogram, snapshot):
+        counts, count, total = snapshot
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for idx, count in enumerate(counts[:-1]):
+            cumulative += int(count)
+            lines.append(f'{name}_bucket{{le="{histogram.upper_bound(idx):.6g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative + int(counts[-1])}')
+        lines.append(f"{name}_sum {total:.9g}")
+        lines.append(f"{name}_count {count}")
+        return lines
+
+    # All metrics in Prometheus text exposition format
+    def render(self):
+        processing = self.processing.snapshot()
+        end_to_end = self.end_to_end.snapshot()
+        lines = []
+        lines += self._histogram_lines('tracker_processing_seconds',
+                                       'Time spent associating one measurement.', self.processing, processing)
+        lines += self._histogram_lines('tracker_end_to_end_seconds',
+                                       'Time from measurement arrival to the end of its processing.', self.end_to_end,
+                                       end_to_end)
+        lines.append('# HELP tracker_latency_quantile_seconds Latency percentiles (bucket upper edges).')
+        lines.append('# TYPE tracker_latency_quantile_seconds gauge')
+        for stage, histogram, snapshot in (('processing', self.processing, processing),
+                                           ('end_to_end', self.end_to_end, end_to_end)):
+            if not snapshot[1]:
+                continue
+            for q in self.QUANTILES:
+                lines.append(f'tracker_latency_quantile_seconds{{stage="{stage}",quantile="{q}"}} '
+                             f'{histogram.quantile(q, snapshot[0]):.6g}')
+        if self.queue_depth is not None:
+            lines.append('# HELP tracker_queue_depth Measurements waiting upstream of the tracker.')
+            lines.append('# TYPE tracker_queue_depth gauge')
+            lines.append(f"tracker_queue_depth {self.queue_depth()}")
+        if self.tracker is not None:
+            counts = self.track_counts()
+            allocated = counts['ids_occupied'] + counts['ids_free']
+            lines.append('# HELP tracker_measurements_total Measurements processed.')
+            lines.append('# TYPE tracker_measurements_total counter')
+            lines.append(f"tracker_measurements_total {self.tracker.processed}")
+            lines.append('# HELP tracker_tracks Live tracks by state.')
+            lines.append('# TYPE tracker_tracks gauge')
+            lines.append(f'tracker_tracks{{state="tentative"}} {counts["tentative"]}')
+            lines.append(f'tracker_tracks{{state="firm"}} {counts["firm"]}')
+            lines.append('# HELP tracker_track_ids Allocated track IDs by pool state.')
+            lines.append('# TYPE tracker_track_ids gauge')
+            lines.append(f'tracker_track_ids{{state="occupied"}} {counts["ids_occupied"]}')
+            lines.append(f'tracker_track_ids{{state="free"}} {counts["ids_free"]}')
+            lines.append('# HELP tracker_track_id_pool_occupancy Fraction of allocated track IDs in use.')
+            lines.append('# TYPE tracker_track_id_pool_occupancy gauge')
+            lines.append(f"tracker_track_id_pool_occupancy {counts['ids_occupied'] / allocated if allocated else 0.0:.6g}")
+        return '\n'.join(lines) + '\n'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Serve `metrics` at http://host:port/metrics from a daemon thread. Binds to localhost
+# by default; port 0 picks a free port, available afterwards as `port`.
+class MetricsServer:
+    def __init__(self, metrics, host='127.0.0.1', port=9108):
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = metrics
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,125 @@
+# Overload protection for the Tracker. Per-measurement processing time is smoothed into an
+# exponential moving average and compared with `latency_budget` (seconds); every
+# `check_every` measurements the memory held by live tracks is estimated and compared with
+# `memory_budget` (bytes). While a budget is exceeded load is shed in priority order:
+#   1. tentative tracks are deleted (and archived, when the tracker has an archive),
+#      lowest hit count first and oldest start first among equal hits, `shed_fraction`
+#      of them (at least one) per round;
+#   2. when a round finds the budget still exceeded right after shedding, or there is no
+#      tentative track left, new initiations are throttled: unassigned plots are
+#      discarded instead of starting tracks.
+# Firm tracks are never touched. Throttling is lifted once both figures fall below
+# `recovery` times their budget. Every shedding round and throttle change is appended to
+# `events` (and passed to `on_event`) as a dict.
+
+# Rough per-object sizes for the memory estimate: one measurement tuple of five floats,
+# and the list, ID entry and counters kept per track slot
+POINT_BYTES = 200
+SLOT_BYTES = 400
+
+class LoadShedder:
+    def __init__(self, latency_budget=None, memory_budget=None, shed_fraction=0.1, cooldown=50,
+                 check_every=100, recovery=0.8, smoothing=0.05, on_event=None):
+        if latency_budget is None and memory_budget is None:
+            raise ValueError("Set a latency_budget, a memory_budget or both.")
+        if not 0.0 < shed_fraction <= 1.0:
+            raise ValueError("shed_fraction must be in (0, 1].")
+        self.latency_budget = latency_budget
+        self.memory_budget = memory_budget
+        self.shed_fraction = shed_fraction
+        self.cooldown = cooldown
+        self.check_every = check_every
+        self.recovery = recovery
+        self.smoothing = smoothing
+        self.on_event = on_event
+        self.latency = 0.0
+        self.memory = 0
+        self.throttled = False
+        self.shed_tracks = 0
+        self.shed_rounds = 0
+        self.throttled_plots = 0
+        self.events = []
+        self._observed = 0
+        self._next_round = 0
+        self._shed_last_round = False
+
+    # Estimated bytes held by the tracker's live tracks (freed slots are not counted)
+    def estimate_memory(self, tracker):
+        lengths = [len(track) for track in tracker.tracks if track]
+        return sum(lengths) * POINT_BYTES + len(lengths) * SLOT_BYTES
+
+    def _record(self, tracker, action, **details):
+        event = dict(plot_index=tracker.processed, action=action, latency=self.latency, memory=self.memory,
+                     **details)
+        self.events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _over_budget(self, factor=1.0):
+        reasons = []
+        if self.latency_budget is not None and self.latency > self.latency_budget * factor:
+            reasons.append('latency')
+        if self.memory_budget is not None and self.memory > self.memory_budget * factor:
+            reasons.append('memory')
+        return reasons
+
+    # Called by the Tracker after each measurement with the time it took
+    def observe(self, tracker, elapsed):
+        self.latency += self.smoothing * (elapsed - self.latency)
+        self._observed += 1
+        if self.throttled:
+            self.throttled_plots += 1
+        if self.memory_budget is not None and self._observed % self.check_every == 0:
+            self.memory = self.estimate_memory(tracker)
+        if self._observed < self._next_round:
+            return
+
+        reasons = self._over_budget()
+        if not reasons:
+            self._shed_last_round = False
+            if self.throttled and not self._over_budget(self.recovery):
+                self.throttled = False
+                self._record(tracker, 'throttle_off')
+            return
+
+        shed = self._shed(tracker)
+        if shed:
+            self.shed_rounds += 1
+            self.shed_tracks += len(shed)
+            self._record(tracker, 'shed', reasons=reasons, track_ids=shed)
+            if self.memory_budget is not None:
+                self.memory = self.estimate_memory(tracker)
+        if not self.throttled and (self._shed_last_round or not shed):
+            self.throttled = True
+            self._record(tracker, 'throttle_on', reasons=reasons)
+        self._shed_last_round = bool(shed)
+        self._next_round = self._observed + self.cooldown
+
+    # Delete the lowest-priority tentative tracks; returns their track IDs
+    def _shed(self, tracker):
+        tentative = [slot for slot, track in enumerate(tracker.tracks) if track and slot not in tracker.firm_ids]
+        if not tentative:
+            return []
+        tentative.sort(key=lambda slot: (tracker.counts(slot)[0], tracker.start_times[slot]))
+        victims = tentative[:max(1, int(len(tentative) * self.shed_fraction))]
+        shed = [tracker.track_id_list[slot]['id'] for slot in victims]
+        for slot in victims:
+            tracker._delete_track(slot, kind='shed')
+        if tracker.query_index is not None:
+            tracker.query_index.commit()
+        return shed
+
+    def stats(self):
+        return {
+            'latency': self.latency,
+            'memory': self.memory,
+            'throttled': self.throttled,
+            'shed_rounds': self.shed_rounds,
+            'shed_tracks': self.shed_tracks,
+            'throttled_plots': self.throttled_plots,
+        }
+
+    def summary(self):
+        return (f"Load shedding: {self.shed_tracks} tentative tracks shed in {self.shed_rounds} rounds, "
+                f"{self.throttled_plots} plots processed with initiation throttled"
+                f"{' (still throttled)' if self.throttled else ''}.")
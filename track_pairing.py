@@ -0,0 +1,119 @@
+import math
+from collections import deque
+
+# Two-point initiation. Plots that match no track are held in a short-lived pool instead
+# of starting a tentative track straight away; a track is only started when a new
+# unassigned plot forms a kinematically plausible pair with a pooled one:
+#   - it is 0 < dt <= max_age seconds later,
+#   - the implied speed (distance / dt) is at most max_speed,
+#   - the two dopplers differ by less than doppler_tolerance,
+#   - with range_rate_tolerance set, the implied range rate (r2 - r1) / dt is within it
+#     of the mean of the two dopplers.
+# Unknown (NaN) dopplers skip the doppler checks they take part in; with one of the two
+# unknown the range rate is compared with the other alone.
+# Among several plausible partners the one with the most consistent range rate (or the
+# nearest, without range_rate_tolerance) is used. Pooled plots live on a spatial hash
+# with cells of max_speed * max_age, the farthest a partner can be, so a lookup only
+# visits the 27 cells around the new plot. Plots expire after max_age seconds.
+class InitiationPool:
+    def __init__(self, max_speed, max_age, doppler_tolerance=float('inf'), range_rate_tolerance=None):
+        if max_speed <= 0 or max_age <= 0:
+            raise ValueError("max_speed and max_age must be positive.")
+        self.max_speed = max_speed
+        self.max_age = max_age
+        self.doppler_tolerance = doppler_tolerance
+        self.range_rate_tolerance = range_rate_tolerance
+        self.cell_size = max_speed * max_age
+        self._cells = {}
+        self._queue = deque()
+        self.pooled = 0
+        self.paired = 0
+        self.expired = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._cells.values())
+
+    def _cell(self, x, y, z):
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size), math.floor(z / size))
+
+    def _discard(self, entry):
+        entries = self._cells.get(entry['cell'])
+        if entries is not None and entry in entries:
+            entries.remove(entry)
+            if not entries:
+                del self._cells[entry['cell']]
+            return True
+        return False
+
+    # Drop pooled plots older than max_age before `time`
+    def expire(self, time):
+        queue = self._queue
+        while queue and queue[0]['time'] < time - self.max_age:
+            if self._discard(queue.popleft()):
+                self.expired += 1
+
+    # Offer an unassigned plot with its Cartesian position and its plot index (kept with a
+    # pooled plot so callers can find it again). Returns the pooled plot it pairs with, as
+    # (measurement, position, plot_index), after removing it from the pool; otherwise
+    # pools the plot and returns None.
+    def offer(self, measurement, position, plot_index=-1):
+        x, y, z = (float(value) for value in position)
+        doppler = float(measurement[3])
+        time = float(measurement[4])
+        self.expire(time)
+        if not (math.isfinite(x) and math.isfinite(y) and math.isfinite(z)):
+            return None
+
+        best = None
+        best_score = float('inf')
+        cx, cy, cz = self._cell(x, y, z)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for entry in self._cells.get((cx + dx, cy + dy, cz + dz), ()):
+                        dt = time - entry['time']
+                        if not 0.0 < dt <= self.max_age:
+                            continue
+                        known = [value for value in (doppler, entry['doppler']) if not math.isnan(value)]
+                        if len(known) == 2 and not abs(known[0] - known[1]) < self.doppler_tolerance:
+                            continue
+                        distance = math.dist((x, y, z), entry['position'])
+                        if distance > self.max_speed * dt:
+                            continue
+                        if self.range_rate_tolerance is not None and known:
+                            range_rate = (float(measurement[2]) - float(entry['measurement'][2])) / dt
+                            score = abs(range_rate - sum(known) / len(known))
+                            if not score <= self.range_rate_tolerance:
+                                continue
+                        else:
+                            score = distance
+                        if score < best_score:
+                            best = entry
+                            best_score = score
+
+        if best is not None:
+            self._discard(best)
+            self.paired += 1
+            return best['measurement'], best['position'], best['plot_index']
+
+        self.add(measurement, (x, y, z), plot_index)
+        self.pooled += 1
+        return None
+
+    # Pool a plot without looking for a partner (used when restoring a checkpoint)
+    def add(self, measurement, position, plot_index=-1):
+        x, y, z = (float(value) for value in position)
+        entry = {'measurement': measurement, 'position': (x, y, z), 'doppler': float(measurement[3]),
+                 'time': float(measurement[4]), 'cell': self._cell(x, y, z), 'plot_index': int(plot_index)}
+        self._cells.setdefault(entry['cell'], []).append(entry)
+        self._queue.append(entry)
+
+    # Waiting plots in arrival order, as (measurement, position, plot_index)
+    def pending(self):
+        live = {id(entry) for entries in self._cells.values() for entry in entries}
+        return [(entry['measurement'], entry['position'], entry['plot_index'])
+                for entry in self._queue if id(entry) in live]
+
+    def stats(self):
+        return {'pooled': self.pooled, 'paired': self.paired, 'expired': self.expired, 'waiting': len(self)}
@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from tracker_core import MEASUREMENT_COLUMNS, doppler_column, precision_dtype, sph2cart
+
+# Staged tracking pipeline with bounded queues between four stages:
+#   parser     - reads the CSV in chunks (pandas, own thread)
+#   converter  - turns each chunk into measurement tuples and Cartesian positions with
+#                whole-array NumPy operations, which release the GIL (own thread)
+#   associator - the single writer: feeds the tracker, measurement by measurement, on
+#                the calling thread
+#   writer     - hands the tracker's events to the real sinks (own thread)
+# The tracker's sinks are swapped for a QueuedSink for the run, so association only
+# appends events to a list and never waits on disk. A full queue blocks its producer,
+# which bounds memory to `queue_size` chunks per stage. An exception in any stage stops
+# the pipeline and is re-raised from run_pipeline().
+# When the tracker has `metrics` (see track_metrics.TrackerMetrics) without a queue depth
+# of its own, its tracker_queue_depth gauge reports the measurements parsed but not yet
+# handed to the tracker for the duration of the run.
+
+_DONE = object()
+
+class PipelineStats:
+    def __init__(self):
+        self.measurements = 0
+        self.chunks = 0
+        self.events = 0
+        self.wall_time = 0.0
+        # Seconds each stage spent working (not waiting on its queues)
+        self.busy = {'parse': 0.0, 'convert': 0.0, 'associate': 0.0, 'write': 0.0}
+        self.max_queue_depth = {'parsed': 0, 'converted': 0, 'events': 0}
+        # Measurements parsed but not yet taken by the associator
+        self.waiting = 0
+        self._waiting_lock = threading.Lock()
+
+    def _add_waiting(self, count):
+        with self._waiting_lock:
+            self.waiting += count
+
+    def summary(self):
+        busy = ', '.join(f"{stage} {seconds:.3f} s" for stage, seconds in self.busy.items())
+        return (f"Processed {self.measurements} measurements in {self.chunks} chunks in {self.wall_time:.3f} s; "
+                f"{self.events} events written. Stage busy time: {busy}.")
+
+# Collects the tracker's events for one chunk; the batch goes to the writer thread.
+# flush() returns False, dropping the batch, once the pipeline is stopping.
+class QueuedSink:
+    def __init__(self, events_queue, stop=None):
+        self._queue = events_queue
+        self._stop = threading.Event() if stop is None else stop
+        self._batch = []
+
+    def write(self, event):
+        self._batch.append(event)
+
+    def flush(self):
+        batch, self._batch = self._batch, []
+        if batch:
+            return _put(self._queue, batch, self._stop)
+        return not self._stop.is_set()
+
+# Chunks of columns keyed by MEASUREMENT_COLUMNS, with doppler and precision handled as
+# by load_measurements_from_csv (a derived doppler carries across chunk boundaries)
+def iter_csv_chunks(file_path, chunksize=65536, doppler='auto', precision='float64'):
+    import pandas as pd
+
+    dtype = precision_dtype(precision)
+    previous = None
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        ranges = chunk['range'].to_numpy(dtype=np.float64)
+        timestamps = chunk['timestamp'].to_numpy(dtype=np.float64)
+        dopplers = doppler_column(chunk, doppler, previous)
+        if len(chunk):
+            previous = (ranges[-1], timestamps[-1])
+        yield {
+            'azimuth': chunk['azimuth'].to_numpy(dtype=np.float64).astype(dtype, copy=False),
+            'elevation': chunk['elevation'].to_numpy(dtype=np.float64).astype(dtype, copy=False),
+            'range': ranges.astype(dtype, copy=False),
+            'doppler': dopplers.astype(dtype, copy=False),
+            'timestamp': timestamps,
+        }
+
+# Measurement tuples and their (x, y, z) positions for one chunk of columns
+def convert_chunk(columns):
+    x, y, z = sph2cart(columns['azimuth'], columns['elevation'], columns['range'])
+    measurements = list(zip(*(columns[name].tolist() for name in MEASUREMENT_COLUMNS)))
+    positions = list(zip(x.tolist(), y.tolist(), z.tolist()))
+    return measurements, positions
+
+class _Stage(threading.Thread):
+    def __init__(self, name, work, errors, stop):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self._work = work
+        self._errors = errors
+        self._stop_event = stop
+
+    def run(self):
+        try:
+            self._work()
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop_event.set()
+
+# Put that gives up when the pipeline is stopping, so no stage blocks forever on a full queue
+def _put(target, item, stop):
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(source, stop):
+    while True:
+        try:
+            return source.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return _DONE
+
+# Run `tracker` over a CSV file (or any iterable of column chunks as produced by
+# iter_csv_chunks) through the staged pipeline. Returns PipelineStats.
+def run_pipeline(source, tracker, chunksize=65536, queue_size=4, doppler='auto', precision='float64'):
+    stats = PipelineStats()
+    stop = threading.Event()
+    errors = []
+    parsed = queue.Queue(queue_size)
+    converted = queue.Queue(queue_size)
+    events = queue.Queue(queue_size)
+    sinks = tracker.sinks
+    queued_sink = QueuedSink(events, stop)
+    chunks = iter_csv_chunks(source, chunksize, doppler, precision) if isinstance(source, str) else iter(source)
+
+    def parse():
+        while not stop.is_set():
+            start = time.perf_counter()
+            columns = next(chunks, _DONE)
+            stats.busy['parse'] += time.perf_counter() - start
+            if columns is not _DONE:
+                stats._add_waiting(len(columns['timestamp']))
+            if not _put(parsed, columns, stop) or columns is _DONE:
+                return
+            stats.max_queue_depth['parsed'] = max(stats.max_queue_depth['parsed'], parsed.qsize())
+
+    def convert():
+        while True:
+            columns = _get(parsed, stop)
+            if columns is _DONE:
+                _put(converted, _DONE, stop)
+                return
+            start = time.perf_counter()
+            chunk = convert_chunk(columns)
+            stats.busy['convert'] += time.perf_counter() - start
+            if not _put(converted, chunk, stop):
+                return
+            stats.max_queue_depth['converted'] = max(stats.max_queue_depth['converted'], converted.qsize())
+
+    def write():
+        while True:
+            batch = _get(events, stop)
+            if batch is _DONE:
+                return
+            start = time.perf_counter()
+            for event in batch:
+                for sink in sinks:
+                    sink.write(event)
+            stats.events += len(batch)
+            stats.busy['write'] += time.perf_counter() - start
+
+    stages = [_Stage('parse', parse, errors, stop), _Stage('convert', convert, errors, stop)]
+    writer = _Stage('write', write, errors, stop)
+    wall_start = time.perf_counter()
+    tracker.sinks = [queued_sink] if sinks else []
+    metrics = tracker.metrics if tracker.metrics is not None and tracker.metrics.queue_depth is None else None
+    if metrics is not None:
+        metrics.queue_depth = lambda: stats.waiting
+    for stage in stages + [writer]:
+        stage.start()
+    try:
+        while True:
+            chunk = _get(converted, stop)
+            if chunk is _DONE:
+                break
+            start = time.perf_counter()
+            measurements, positions = chunk
+            stats._add_waiting(-len(measurements))
+            for measurement, position in zip(measurements, positions):
+                tracker.process(measurement, cartesian=position)
+            stats.measurements += len(measurements)
+            stats.chunks += 1
+            flushed = queued_sink.flush()
+            stats.busy['associate'] += time.perf_counter() - start
+            stats.max_queue_depth['events'] = max(stats.max_queue_depth['events'], events.qsize())
+            # A failed stage (the writer included) stops the pipeline; its error is raised below
+            if not flushed or stop.is_set() or errors:
+                break
+        _put(events, _DONE, stop)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+        writer.join()
+        tracker.sinks = sinks
+        if metrics is not None:
+            metrics.queue_depth = None
+    if errors:
+        raise errors[0]
+    stats.wall_time = time.perf_counter() - wall_start
+    return stats
@@ -0,0 +1,90 @@
+import numpy as np
+
+from tracker_core import precision_dtype
+
+# Constant-velocity alpha-beta filter holding position/velocity state for every track in
+# NumPy arrays, indexed by track position in the `tracks` list. predict() advances all
+# tracks to a measurement time in one vectorized step so gates can compare against the
+# predicted position instead of the raw last measurement.
+# A single-plot track has no velocity yet; max_speed widens its gate by the distance such
+# a target could cover since that plot, so the second plot can still be picked up.
+# With precision='float32' positions, velocities and gate distances are single precision;
+# track times stay float64 and only the time offsets to the prediction time are narrowed.
+class AlphaBetaPredictor:
+    def __init__(self, alpha=0.6, beta=0.2, max_speed=0.0, capacity=64, precision='float64'):
+        self.alpha = alpha
+        self.beta = beta
+        self.max_speed = max_speed
+        self.precision = precision
+        dtype = precision_dtype(precision)
+        self.positions = np.zeros((capacity, 3), dtype=dtype)
+        self.velocities = np.zeros((capacity, 3), dtype=dtype)
+        self.times = np.zeros(capacity)
+        self.updates = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.size = 0
+
+    def _ensure_capacity(self, track_id):
+        capacity = len(self.times)
+        if track_id < capacity:
+            return
+        while capacity <= track_id:
+            capacity *= 2
+        extra = capacity - len(self.times)
+        dtype = self.positions.dtype
+        self.positions = np.vstack([self.positions, np.zeros((extra, 3), dtype=dtype)])
+        self.velocities = np.vstack([self.velocities, np.zeros((extra, 3), dtype=dtype)])
+        self.times = np.concatenate([self.times, np.zeros(extra)])
+        self.updates = np.concatenate([self.updates, np.zeros(extra, dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+
+    # Start a track at a measured position with zero velocity
+    def start(self, track_id, position, time):
+        self._ensure_capacity(track_id)
+        self.positions[track_id] = position
+        self.velocities[track_id] = 0.0
+        self.times[track_id] = time
+        self.updates[track_id] = 0
+        self.active[track_id] = True
+        self.size = max(self.size, track_id + 1)
+
+    # Correct a track with an associated measurement. The first update initializes the
+    # velocity from the two points, later ones apply the alpha-beta gains.
+    def update(self, track_id, position, time):
+        position = np.asarray(position, dtype=self.positions.dtype)
+        dt = self.positions.dtype.type(time - self.times[track_id])
+        if self.updates[track_id] == 0:
+            if dt > 0:
+                self.velocities[track_id] = (position - self.positions[track_id]) / dt
+            self.positions[track_id] = position
+        else:
+            predicted = self.positions[track_id] + self.velocities[track_id] * dt
+            residual = position - predicted
+            self.positions[track_id] = predicted + self.alpha * residual
+            if dt > 0:
+                self.velocities[track_id] += (self.beta / dt) * residual
+        self.times[track_id] = time
+        self.updates[track_id] += 1
+
+    def remove(self, track_id):
+        if track_id < self.size:
+            self.active[track_id] = False
+
+    # Predicted positions of all tracks at `time`, shape (size, 3); inactive rows are NaN
+    def predict(self, time):
+        n = self.size
+        dt = (time - self.times[:n]).astype(self.positions.dtype, copy=False)
+        predicted = self.positions[:n] + self.velocities[:n] * dt[:, None]
+        predicted[~self.active[:n]] = np.nan
+        return predicted
+
+    # Gate distances from a Cartesian position to every track's prediction at `time`,
+    # reduced by the max_speed allowance for tracks without a velocity estimate
+    def distances(self, position, time):
+        n = self.size
+        distances = np.linalg.norm(self.predict(time) - np.asarray(position, dtype=self.positions.dtype), axis=1)
+        if self.max_speed:
+            uninitialized = self.updates[:n] == 0
+            slack = self.max_speed * np.abs(time - self.times[:n][uninitialized])
+            distances[uninitialized] = np.maximum(distances[uninitialized] - slack, 0.0)
+        return distances
@@ -0,0 +1,123 @@
+import math
+import threading
+
+# Spatial index of live track tails for downstream queries: radius, box and azimuth/range
+# sector. Tails are bucketed on a horizontal (x, y) grid of `cell_size` and kept up to
+# date incrementally by the Tracker. Changes made while one measurement is processed are
+# staged and applied together in commit(), under a lock that queries also take, so every
+# query sees the tracker state between two measurements even when it runs on another
+# thread.
+class TrackQueryIndex:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.version = 0
+        self._cells = {}
+        self._records = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    # Stage the new tail of a track slot: its track ID, state, (az, el, r) and Cartesian position
+    def update(self, slot, track_id, state, measurement, position):
+        x, y, z = (float(value) for value in position)
+        if not (math.isfinite(x) and math.isfinite(y) and math.isfinite(z)):
+            self._pending[slot] = None
+            return
+        self._pending[slot] = {
+            'track_id': track_id,
+            'state': state,
+            'azimuth': float(measurement[0]) % 360.0,
+            'elevation': float(measurement[1]),
+            'range': float(measurement[2]),
+            'doppler': float(measurement[3]),
+            'timestamp': float(measurement[4]),
+            'position': (x, y, z),
+        }
+
+    def remove(self, slot):
+        self._pending[slot] = None
+
+    # Publish all staged changes at once
+    def commit(self):
+        if not self._pending:
+            return
+        with self._lock:
+            for slot, record in self._pending.items():
+                old = self._records.pop(slot, None)
+                if old is not None:
+                    members = self._cells[old['cell']]
+                    members.discard(slot)
+                    if not members:
+                        del self._cells[old['cell']]
+                if record is not None:
+                    record['cell'] = self._cell(record['position'][0], record['position'][1])
+                    self._records[slot] = record
+                    self._cells.setdefault(record['cell'], set()).add(slot)
+            self.version += 1
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    # Records in the grid cells overlapping an (x, y) bounding box, copied under the lock
+    def _candidates(self, x_min, y_min, x_max, y_max, state):
+        cx_min, cy_min = self._cell(x_min, y_min)
+        cx_max, cy_max = self._cell(x_max, y_max)
+        found = []
+        with self._lock:
+            if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self._cells):
+                slots = [slot for members in self._cells.values() for slot in members]
+            else:
+                slots = [slot for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)
+                         for slot in self._cells.get((cx, cy), ())]
+            for slot in slots:
+                record = self._records[slot]
+                if state is None or record['state'] == state:
+                    found.append(dict(record))
+        for record in found:
+            del record['cell']
+        return found
+
+    # Tracks whose tail lies within `radius` of the Cartesian point `center`
+    def radius(self, center, radius, state=None):
+        cx, cy, cz = center
+        found = self._candidates(cx - radius, cy - radius, cx + radius, cy + radius, state)
+        return [record for record in found if math.dist(record['position'], center) <= radius]
+
+    # Tracks whose tail lies inside the axis-aligned box [lower, upper]
+    def box(self, lower, upper, state=None):
+        found = self._candidates(lower[0], lower[1], upper[0], upper[1], state)
+        return [record for record in found
+                if all(lower[axis] <= record['position'][axis] <= upper[axis] for axis in range(3))]
+
+    # Tracks whose tail azimuth is within [az_min, az_max] (degrees, wrapping through 0
+    # when az_min > az_max; a span of 360 or more is the full circle) and whose range is
+    # within [range_min, range_max]
+    def sector(self, az_min, az_max, range_min, range_max, state=None):
+        full_circle = az_max - az_min >= 360.0
+        az_min %= 360.0
+        az_max %= 360.0
+        if full_circle:
+            span = 360.0
+        elif az_min <= az_max:
+            span = az_max - az_min
+        else:
+            span = 360.0 - az_min + az_max
+        angles = [az_min, az_min + span] + [a for a in (0.0, 90.0, 180.0, 270.0, 360.0, 450.0, 540.0, 630.0)
+                                             if az_min <= a <= az_min + span]
+        # Elevated tails project closer to the origin than their slant range, so the
+        # horizontal bounding box runs from the origin out to range_max
+        xs = [0.0]
+        ys = [0.0]
+        for angle in angles:
+            xs.append(range_max * math.cos(math.radians(angle)))
+            ys.append(range_max * math.sin(math.radians(angle)))
+        found = self._candidates(min(xs), min(ys), max(xs), max(ys), state)
+        result = []
+        for record in found:
+            offset = (record['azimuth'] - az_min) % 360.0
+            if offset <= span and range_min <= record['range'] <= range_max:
+                result.append(record)
+        return result
@@ -0,0 +1,60 @@
+import heapq
+
+# Bounded reorder stage for live feeds. Measurements are held in a heap keyed on
+# timestamp and released once the newest timestamp seen is more than `max_lateness`
+# ahead of them, so the output is in timestamp order and no measurement waits longer
+# than max_lateness of stream time. A measurement older than one already released
+# cannot be put back in order; it is counted in `late` and handed to `on_late` (or kept
+# in `late_measurements` when no callback is given) instead of reaching the tracker.
+class ReorderBuffer:
+    def __init__(self, max_lateness, on_late=None):
+        self.max_lateness = max_lateness
+        self.on_late = on_late
+        self.late = 0
+        self.late_measurements = []
+        self.max_pending = 0
+        self.released_until = float('-inf')
+        self._newest = float('-inf')
+        self._heap = []
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    # Add one measurement; returns the measurements it makes releasable, in order
+    def push(self, measurement):
+        measurement_time = measurement[4]
+        if measurement_time < self.released_until:
+            self.late += 1
+            if self.on_late is not None:
+                self.on_late(measurement)
+            else:
+                self.late_measurements.append(measurement)
+            return []
+        # The sequence number keeps arrival order for equal timestamps
+        heapq.heappush(self._heap, (measurement_time, self._sequence, measurement))
+        self._sequence += 1
+        self.max_pending = max(self.max_pending, len(self._heap))
+        if measurement_time > self._newest:
+            self._newest = measurement_time
+        return self._release(self._newest - self.max_lateness)
+
+    def _release(self, watermark):
+        released = []
+        heap = self._heap
+        while heap and heap[0][0] <= watermark:
+            measurement_time, _, measurement = heapq.heappop(heap)
+            self.released_until = measurement_time
+            released.append(measurement)
+        return released
+
+    # Release everything still held, e.g. at the end of a recording
+    def flush(self):
+        return self._release(float('inf'))
+
+# Reorder a measurement stream through a ReorderBuffer, yielding in timestamp order
+def reorder(measurements, max_lateness, on_late=None, buffer=None):
+    buffer = ReorderBuffer(max_lateness, on_late) if buffer is None else buffer
+    for measurement in measurements:
+        yield from buffer.push(measurement)
+    yield from buffer.flush()
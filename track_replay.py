@@ -0,0 +1,160 @@
+import argparse
+import time
+
+from track_metrics import MetricsServer, TrackerMetrics
+from track_overload import LoadShedder
+from track_reorder import ReorderBuffer, reorder
+from track_sinks import open_sink
+from tracker_core import Tracker, load_measurements_from_csv
+
+# Outcome of a replay run. Lag is how far behind the (scaled) recording clock a
+# measurement started processing; a deadline is missed when that lag exceeds the
+# tolerance given to replay().
+class ReplayStats:
+    def __init__(self):
+        self.processed = 0
+        self.wall_time = 0.0
+        self.recording_span = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.missed_deadlines = 0
+
+    @property
+    def throughput(self):
+        return self.processed / self.wall_time if self.wall_time > 0 else float('inf')
+
+    @property
+    def mean_lag(self):
+        return self.total_lag / self.processed if self.processed else 0.0
+
+    def summary(self):
+        return (f"Processed {self.processed} measurements in {self.wall_time:.3f} s "
+                f"({self.throughput:.1f} measurements/s) covering {self.recording_span:.3f} s of recording.\n"
+                f"Lag behind recording clock: mean {self.mean_lag * 1000:.3f} ms, max {self.max_lag * 1000:.3f} ms. "
+                f"Missed deadlines: {self.missed_deadlines}.")
+
+# Drive a tracker with measurements paced by their timestamp column.
+# speed=1.0 replays in real time, speed=N at N times real time, speed=None as fast as
+# possible. The tracker always sees the same measurements in the same order, so the
+# resulting tracks do not depend on the pacing; only the timing statistics do.
+# `clock` and `sleep` can be replaced for simulated time. With `metrics` the end-to-end
+# latency of each measurement, from its scheduled arrival (or, unpaced, from when it was
+# taken from the input) to the end of its processing, goes into metrics.end_to_end.
+def replay(measurements, tracker, speed=1.0, deadline_tolerance=0.01, on_measurement=None,
+           clock=time.perf_counter, sleep=time.sleep, metrics=None):
+    stats = ReplayStats()
+    first_time = None
+    last_time = None
+    wall_start = clock()
+
+    for measurement in measurements:
+        measurement_time = measurement[4]
+        if first_time is None:
+            first_time = measurement_time
+        last_time = measurement_time
+
+        arrival = None
+        if speed:
+            scheduled = wall_start + (measurement_time - first_time) / speed
+            arrival = scheduled
+            now = clock()
+            if now < scheduled:
+                sleep(scheduled - now)
+                now = clock()
+            lag = max(now - scheduled, 0.0)
+            stats.total_lag += lag
+            stats.max_lag = max(stats.max_lag, lag)
+            if lag > deadline_tolerance:
+                stats.missed_deadlines += 1
+
+        if metrics is not None and arrival is None:
+            arrival = clock()
+        track_idx = tracker.process(measurement)
+        if metrics is not None:
+            metrics.observe_end_to_end(max(clock() - arrival, 0.0))
+        stats.processed += 1
+        if on_measurement is not None:
+            on_measurement(measurement, track_idx)
+
+    stats.wall_time = clock() - wall_start
+    if first_time is not None:
+        stats.recording_span = float(last_time - first_time)
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded measurement file through the tracker.')
+    parser.add_argument('file', help='measurement CSV with a timestamp column')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='replay speed as a multiple of real time; 0 replays as fast as possible')
+    parser.add_argument('--deadline', type=float, default=0.01, help='lag tolerance in seconds')
+    parser.add_argument('--doppler-threshold', type=float, default=2.0)
+    parser.add_argument('--range-threshold', type=float, default=10.0)
+    parser.add_argument('--time-threshold', type=float, default=2.0)
+    parser.add_argument('--firm-threshold', type=int, default=3)
+    parser.add_argument('--output', help='stream track events to a .csv, .jsonl or .bin file')
+    parser.add_argument('--max-lateness', type=float,
+                        help='reorder out-of-order measurements held up to this many seconds')
+    parser.add_argument('--latency-budget', type=float,
+                        help='shed tentative tracks when mean processing time exceeds this many seconds')
+    parser.add_argument('--memory-budget', type=float,
+                        help='shed tentative tracks when live tracks exceed this many megabytes')
+    parser.add_argument('--doppler', default='auto', choices=['auto', 'measured', 'derived'],
+                        help='doppler source (see tracker_core.doppler_column)')
+    parser.add_argument('--precision', default='float64', choices=['float64', 'float32'],
+                        help='precision of loaded positions, angles and dopplers; timestamps stay float64')
+    parser.add_argument('--start', type=float, help='replay from this timestamp (uses the seek index)')
+    parser.add_argument('--end', type=float, help='replay up to this timestamp (uses the seek index)')
+    parser.add_argument('--merge-distance', type=float,
+                        help='merge tracks whose tails are closer than this every --merge-every measurements')
+    parser.add_argument('--merge-every', type=int, default=1, help='measurements between duplicate merge passes')
+    parser.add_argument('--metrics-port', type=int,
+                        help='serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the replay')
+    args = parser.parse_args(argv)
+
+    measurements = load_measurements_from_csv(args.file, args.start, args.end, doppler=args.doppler,
+                                              precision=args.precision)
+    reorder_buffer = None
+    if args.max_lateness is not None:
+        reorder_buffer = ReorderBuffer(args.max_lateness)
+        measurements = reorder(measurements, args.max_lateness, buffer=reorder_buffer)
+    load_shedder = None
+    if args.latency_budget is not None or args.memory_budget is not None:
+        memory_budget = args.memory_budget * 1e6 if args.memory_budget is not None else None
+        load_shedder = LoadShedder(latency_budget=args.latency_budget, memory_budget=memory_budget)
+    sinks = [open_sink(args.output)] if args.output else []
+    merge_tolerances = None
+    if args.merge_distance is not None:
+        merge_tolerances = (args.merge_distance, args.doppler_threshold, args.time_threshold)
+    tracker = Tracker(args.doppler_threshold, args.range_threshold, args.firm_threshold, args.time_threshold,
+                      sinks=sinks, keep_history=not sinks, load_shedder=load_shedder,
+                      merge_tolerances=merge_tolerances, merge_every=args.merge_every)
+    metrics = None
+    metrics_server = None
+    if args.metrics_port is not None:
+        queue_depth = (lambda: len(reorder_buffer)) if reorder_buffer is not None else None
+        metrics = TrackerMetrics(tracker, queue_depth=queue_depth)
+        tracker.metrics = metrics
+        metrics_server = MetricsServer(metrics, port=args.metrics_port)
+        print(f"Serving metrics on http://{metrics_server.host}:{metrics_server.port}/metrics")
+    try:
+        stats = replay(measurements, tracker, speed=args.speed or None, deadline_tolerance=args.deadline,
+                       metrics=metrics)
+    finally:
+        for sink in sinks:
+            sink.close()
+        if metrics_server is not None:
+            metrics_server.close()
+    print(stats.summary())
+    if reorder_buffer is not None:
+        print(f"Reorder buffer: {reorder_buffer.late} late measurements diverted, "
+              f"at most {reorder_buffer.max_pending} held.")
+    if load_shedder is not None:
+        print(load_shedder.summary())
+    if metrics is not None:
+        for stage, histogram in (('Processing', metrics.processing), ('End-to-end', metrics.end_to_end)):
+            percentiles = histogram.percentiles()
+            print(f"{stage} latency: p50 {percentiles['p50'] * 1000:.3f} ms, p99 {percentiles['p99'] * 1000:.3f} ms, "
+                  f"p999 {percentiles['p999'] * 1000:.3f} ms.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import numpy as np
+
+from tracker_core import Tracker, precision_dtype
+
+# Columnar result format. A PlotLog attached to a Tracker records one row per processed
+# plot straight into growable NumPy columns, so results come out as a structured array
+# (or DataFrame) without building a Python object per row, and the per-track summary is
+# computed with vectorized group-bys over those columns.
+PLOT_KINDS = ('dropped', 'initiated', 'assigned', 'pooled')
+PLOT_STATES = ('none', 'tentative', 'firm')
+
+# Row layout for a precision; the measurement values follow it, timestamps stay float64
+def plot_dtype(precision='float64'):
+    value = precision_dtype(precision)
+    return np.dtype([
+        ('plot_index', np.int64),
+        ('track_id', np.int64),
+        ('track_instance', np.int64),
+        ('kind', np.uint8),
+        ('state', np.uint8),
+        ('hits', np.int64),
+        ('misses', np.int64),
+        ('azimuth', value),
+        ('elevation', value),
+        ('range', value),
+        ('doppler', value),
+        ('timestamp', np.float64),
+    ])
+
+PLOT_DTYPE = plot_dtype()
+
+SUMMARY_DTYPE = np.dtype([
+    ('track_instance', np.int64),
+    ('track_id', np.int64),
+    ('plots', np.int64),
+    ('first_plot', np.int64),
+    ('last_plot', np.int64),
+    ('first_time', np.float64),
+    ('last_time', np.float64),
+    ('firm', np.bool_),
+    ('final_state', np.uint8),
+    ('final_hits', np.int64),
+    ('final_misses', np.int64),
+])
+
+class PlotLog:
+    def __init__(self, capacity=1024, precision='float64'):
+        self.dtype = plot_dtype(precision)
+        self._rows = np.zeros(capacity, dtype=self.dtype)
+        self.size = 0
+        # A track instance is one lifetime of a track ID, from initiation to deletion
+        self._instances = 0
+        self._slot_instance = {}
+
+    def record(self, plot_index, kind, slot, track_id, state, hits, misses, measurement):
+        if self.size == len(self._rows):
+            self._rows = np.concatenate([self._rows, np.zeros(len(self._rows), dtype=self.dtype)])
+        if kind == 1:
+            self._instances += 1
+            self._slot_instance[slot] = self._instances
+        row = self._rows[self.size]
+        row['plot_index'] = plot_index
+        row['track_id'] = track_id
+        row['track_instance'] = self._slot_instance.get(slot, 0) if kind in (1, 2) else 0
+        row['kind'] = kind
+        row['state'] = state
+        row['hits'] = hits
+        row['misses'] = misses
+        row['azimuth'] = measurement[0]
+        row['elevation'] = measurement[1]
+        row['range'] = measurement[2]
+        row['doppler'] = measurement[3]
+        row['timestamp'] = measurement[4]
+        self.size += 1
+
+    # Rewrite an already recorded plot, e.g. a pooled plot that turned out to start a track.
+    # Rows are in plot order, so the row is found by bisection; a plot recorded before this
+    # log was attached is left alone.
+    def relabel(self, plot_index, kind, slot, track_id, state, hits, misses):
+        plot_indices = self._rows['plot_index'][:self.size]
+        idx = int(np.searchsorted(plot_indices, plot_index))
+        if idx == self.size or plot_indices[idx] != plot_index:
+            return False
+        if kind == 1:
+            self._instances += 1
+            self._slot_instance[slot] = self._instances
+        row = self._rows[idx]
+        row['track_id'] = track_id
+        row['track_instance'] = self._slot_instance.get(slot, 0) if kind in (1, 2) else 0
+        row['kind'] = kind
+        row['state'] = state
+        row['hits'] = hits
+        row['misses'] = misses
+        return True
+
+    # Per-plot structured array (a view of the recorded rows)
+    def plots(self):
+        return self._rows[:self.size]
+
+    # One row per track instance, computed with sorting and reduceat over the plot columns
+    def summary(self):
+        plots = self.plots()
+        plots = plots[plots['track_instance'] > 0]
+        if not len(plots):
+            return np.zeros(0, dtype=SUMMARY_DTYPE)
+        order = np.argsort(plots['track_instance'], kind='stable')
+        ordered = plots[order]
+        instances, starts, counts = np.unique(ordered['track_instance'], return_index=True, return_counts=True)
+        ends = starts + counts - 1
+
+        summary = np.zeros(len(instances), dtype=SUMMARY_DTYPE)
+        summary['track_instance'] = instances
+        summary['track_id'] = ordered['track_id'][starts]
+        summary['plots'] = counts
+        summary['first_plot'] = ordered['plot_index'][starts]
+        summary['last_plot'] = ordered['plot_index'][ends]
+        summary['first_time'] = np.minimum.reduceat(ordered['timestamp'], starts)
+        summary['last_time'] = np.maximum.reduceat(ordered['timestamp'], starts)
+        summary['firm'] = np.maximum.reduceat(ordered['state'], starts) == 2
+        summary['final_state'] = ordered['state'][ends]
+        summary['final_hits'] = ordered['hits'][ends]
+        summary['final_misses'] = ordered['misses'][ends]
+        return summary
+
+    # The same two tables as pandas DataFrames, with kind/state codes as categoricals
+    def to_dataframes(self):
+        import pandas as pd
+
+        plots = pd.DataFrame(self.plots())
+        plots['kind'] = pd.Categorical.from_codes(plots['kind'], PLOT_KINDS)
+        plots['state'] = pd.Categorical.from_codes(plots['state'], PLOT_STATES)
+        summary = pd.DataFrame(self.summary())
+        summary['final_state'] = pd.Categorical.from_codes(summary['final_state'], PLOT_STATES)
+        return plots, summary
+
+# Track a measurement sequence and return (plots, summary) as structured arrays, or as
+# DataFrames with as_dataframe=True. Extra keyword arguments go to Tracker.
+def initialize_tracks_table(measurements, doppler_threshold, range_threshold, firm_threshold, time_threshold,
+                            as_dataframe=False, precision='float64', **tracker_options):
+    plot_log = PlotLog(precision=precision)
+    tracker = Tracker(doppler_threshold, range_threshold, firm_threshold, time_threshold,
+                      plot_log=plot_log, **tracker_options)
+    for measurement in measurements:
+        tracker.process(measurement)
+    if as_dataframe:
+        return plot_log.to_dataframes()
+    return plot_log.plots(), plot_log.summary()
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+
+import numpy as np
+
+from tracker_core import MEASUREMENT_COLUMNS, doppler_column
+
+# Sparse timestamp index for large measurement CSVs, kept in a sidecar file next to the
+# recording (<file>.seek.npz). Rows are grouped in blocks of `block_rows`; for each block
+# the index stores its byte offset, first row number, time span and the byte offset of
+# the row just before it. A time window is then read by seeking straight to the blocks
+# whose span overlaps it; reading starts one row early so a derived doppler comes from
+# the same parsed values a full load_measurements_from_csv would use. Out-of-order
+# timestamps are fine: blocks are selected on their min/max times, not by bisection.
+# The sidecar records the CSV's size and modification time and is rebuilt when stale.
+SEEK_INDEX_VERSION = 1
+
+def seek_index_path(csv_path):
+    return f"{csv_path}.seek.npz"
+
+def _file_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+# Scan the CSV once and write its sidecar index; returns the index dict
+def build_seek_index(csv_path, block_rows=4096):
+    offsets = []
+    first_rows = []
+    t_min = []
+    t_max = []
+    prev_offsets = []
+    row = 0
+    last_offset = -1
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        columns = [name.strip().decode('utf-8') for name in header.split(b',')]
+        time_col = columns.index('timestamp')
+        offset = len(header)
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            t = float(line.split(b',')[time_col])
+            if row % block_rows == 0:
+                offsets.append(line_offset)
+                first_rows.append(row)
+                t_min.append(t)
+                t_max.append(t)
+                prev_offsets.append(last_offset)
+            else:
+                t_min[-1] = min(t_min[-1], t)
+                t_max[-1] = max(t_max[-1], t)
+            last_offset = line_offset
+            row += 1
+
+    meta = dict(_file_signature(csv_path), version=SEEK_INDEX_VERSION, rows=row, block_rows=block_rows,
+                header=header.decode('utf-8'), end_offset=offset)
+    index = {
+        'meta': meta,
+        'offsets': np.array(offsets, dtype=np.int64),
+        'first_rows': np.array(first_rows, dtype=np.int64),
+        't_min': np.array(t_min, dtype=np.float64),
+        't_max': np.array(t_max, dtype=np.float64),
+        'prev_offsets': np.array(prev_offsets, dtype=np.int64),
+    }
+    path = seek_index_path(csv_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **{k: v for k, v in index.items() if k != 'meta'})
+    os.replace(tmp_path, path)
+    return index
+
+# Load the sidecar index, building (or rebuilding a stale one) when `build` is True
+def load_seek_index(csv_path, build=True, block_rows=4096):
+    path = seek_index_path(csv_path)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            index = {name: data[name] for name in data.files if name != 'meta'}
+        index['meta'] = meta
+        signature = _file_signature(csv_path)
+        if (meta.get('version') == SEEK_INDEX_VERSION and meta['size'] == signature['size']
+                and meta['mtime_ns'] == signature['mtime_ns']):
+            return index
+    if not build:
+        raise ValueError(f"No up-to-date seek index for {csv_path}.")
+    return build_seek_index(csv_path, block_rows)
+
+# Contiguous runs of blocks overlapping [start_time, end_time], as (first, last) block numbers
+def _block_runs(index, start_time, end_time):
+    selected = np.ones(len(index['offsets']), dtype=bool)
+    if start_time is not None:
+        selected &= index['t_max'] >= start_time
+    if end_time is not None:
+        selected &= index['t_min'] <= end_time
+    blocks = np.flatnonzero(selected)
+    if not len(blocks):
+        return []
+    breaks = np.flatnonzero(np.diff(blocks) > 1)
+    starts = np.concatenate([[blocks[0]], blocks[breaks + 1]])
+    ends = np.concatenate([blocks[breaks], [blocks[-1]]])
+    return list(zip(starts.tolist(), ends.tolist()))
+
+# Read the rows with start_time <= timestamp <= end_time (either bound may be None) as
+# float64 columns keyed by tracker_core.MEASUREMENT_COLUMNS, seeking past the rest of the
+# file. `doppler` is handled as by the full loaders (see tracker_core.doppler_column).
+def read_time_window(csv_path, start_time=None, end_time=None, index=None, doppler='auto'):
+    import pandas as pd
+
+    index = load_seek_index(csv_path) if index is None else index
+    meta = index['meta']
+    header = meta['header'].encode('utf-8')
+    offsets = index['offsets']
+    pieces = []
+    with open(csv_path, 'rb') as f:
+        for first, last in _block_runs(index, start_time, end_time):
+            end_offset = offsets[last + 1] if last + 1 < len(offsets) else meta['end_offset']
+            # Start at the preceding row when there is one; it only feeds a derived first doppler
+            read_from = int(index['prev_offsets'][first]) if index['first_rows'][first] > 0 else int(offsets[first])
+            f.seek(read_from)
+            df = pd.read_csv(io.BytesIO(header + f.read(int(end_offset) - read_from)))
+            ranges = df['range'].to_numpy(dtype=np.float64)
+            timestamps = df['timestamp'].to_numpy(dtype=np.float64)
+            dopplers = doppler_column(df, doppler)
+            keep = np.ones(len(df), dtype=bool)
+            if index['first_rows'][first] > 0:
+                keep[0] = False
+            if start_time is not None:
+                keep &= timestamps >= start_time
+            if end_time is not None:
+                keep &= timestamps <= end_time
+            pieces.append({
+                'azimuth': df['azimuth'].to_numpy(dtype=np.float64)[keep],
+                'elevation': df['elevation'].to_numpy(dtype=np.float64)[keep],
+                'range': ranges[keep],
+                'doppler': dopplers[keep],
+                'timestamp': timestamps[keep],
+            })
+    if not pieces:
+        return {name: np.zeros(0) for name in MEASUREMENT_COLUMNS}
+    return {name: np.concatenate([piece[name] for piece in pieces]) for name in MEASUREMENT_COLUMNS}
@@ -0,0 +1,93 @@
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tracker_core import MEASUREMENT_COLUMNS
+
+# Measurement columns held in multiprocessing.shared_memory blocks, one block per column.
+# The owner creates the blocks once; worker processes attach NumPy views to them from a
+# small picklable descriptor, so nothing is copied or pickled per worker.
+class SharedMeasurements:
+    def __init__(self, blocks, columns, length, owner):
+        self._blocks = blocks
+        self.columns = columns
+        self.length = length
+        self.owner = owner
+
+    # Copy columns (as returned by load_measurement_columns) into new shared blocks
+    @classmethod
+    def create(cls, columns):
+        length = len(columns[MEASUREMENT_COLUMNS[0]])
+        blocks = {}
+        views = {}
+        try:
+            for name in MEASUREMENT_COLUMNS:
+                source = np.ascontiguousarray(columns[name])
+                block = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+                blocks[name] = block
+                view = np.ndarray(source.shape, dtype=source.dtype, buffer=block.buf)
+                view[:] = source
+                views[name] = view
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        return cls(blocks, views, length, owner=True)
+
+    # Attach read-only views in another process
+    @classmethod
+    def attach(cls, descriptor):
+        blocks = {}
+        views = {}
+        for name, (block_name, dtype) in descriptor['blocks'].items():
+            block = _attach_block(block_name)
+            blocks[name] = block
+            view = np.ndarray((descriptor['length'],), dtype=np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+            views[name] = view
+        return cls(blocks, views, descriptor['length'], owner=False)
+
+    # Picklable description workers need to attach
+    @property
+    def descriptor(self):
+        return {
+            'length': self.length,
+            'blocks': {name: (self._blocks[name].name, self.columns[name].dtype.str) for name in self._blocks},
+        }
+
+    def __len__(self):
+        return self.length
+
+    # Yield (az, el, r, doppler, t) tuples for the tracker, converting one chunk at a time
+    def iter_rows(self, start=0, stop=None, chunksize=65536):
+        stop = self.length if stop is None else min(stop, self.length)
+        for chunk_start in range(start, stop, chunksize):
+            chunk_stop = min(chunk_start + chunksize, stop)
+            yield from zip(*(self.columns[name][chunk_start:chunk_stop].tolist() for name in MEASUREMENT_COLUMNS))
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    # Drop this process's views and mappings; the owner also frees the blocks
+    def close(self):
+        self.columns = {}
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Attach to an existing block. Processes started by multiprocessing share the owner's
+# resource tracker, so the attachment is not cleaned up separately when a worker exits.
+def _attach_block(block_name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=block_name, track=False)
+    return shared_memory.SharedMemory(name=block_name)
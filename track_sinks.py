@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import math
+import os
+import struct
+
+# Layout of the events the Tracker hands to its sinks. `kind` is one of EVENT_KINDS and
+# `state` the track state after the event ('tentative', 'firm' or 'free' once deleted).
+# A 'merged' event is emitted for a duplicate track folded into a lower track ID, and a
+# 'shed' event for a tentative track dropped by overload protection.
+EVENT_FIELDS = ('plot_index', 'kind', 'track_id', 'state', 'azimuth', 'elevation', 'range', 'doppler',
+                'timestamp', 'hits', 'misses')
+EVENT_KINDS = ('initiated', 'assigned', 'firm', 'deleted', 'merged', 'shed')
+TRACK_STATES = ('tentative', 'firm', 'free')
+
+# Base class for streaming sinks: events are encoded into an in-memory buffer that is
+# written to the file every `buffer_size` events and on flush()/close().
+class TrackSink:
+    def __init__(self, path, buffer_size=1024, mode='w'):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.written = 0
+        if 'b' in mode:
+            self._file = open(path, mode)
+            self._joiner = b''
+        else:
+            self._file = open(path, mode, newline='', encoding='utf-8')
+            self._joiner = ''
+        self._buffer = []
+
+    def encode(self, event):
+        raise NotImplementedError
+
+    def write(self, event):
+        self._buffer.append(self.encode(event))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._joiner.join(self._buffer))
+            self.written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class CsvSink(TrackSink):
+    def __init__(self, path, buffer_size=1024):
+        super().__init__(path, buffer_size)
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line)
+        self._file.write(','.join(EVENT_FIELDS) + '\r\n')
+
+    def encode(self, event):
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow(event)
+        return self._line.getvalue()
+
+# One JSON object per line. Non-finite floats (an unknown doppler is NaN) are written as
+# null, since NaN and Infinity are not valid JSON.
+class JsonLinesSink(TrackSink):
+    def encode(self, event):
+        record = dict(zip(EVENT_FIELDS, event))
+        for name in ('azimuth', 'elevation', 'range', 'doppler', 'timestamp'):
+            value = float(record[name])
+            record[name] = value if math.isfinite(value) else None
+        for name in ('plot_index', 'track_id', 'hits', 'misses'):
+            record[name] = int(record[name])
+        return json.dumps(record, allow_nan=False) + '\n'
+
+# Fixed-size little-endian records behind an 8-byte file magic: plot index, track ID,
+# kind and state codes (indices into EVENT_KINDS/TRACK_STATES), az, el, range, doppler,
+# timestamp, hits, misses. read_binary_events() decodes them back.
+BINARY_MAGIC = b'TRKEVT1\0'
+BINARY_RECORD = struct.Struct('<qqBBdddddii')
+
+class BinarySink(TrackSink):
+    def __init__(self, path, buffer_size=4096):
+        super().__init__(path, buffer_size, mode='wb')
+        self._file.write(BINARY_MAGIC)
+
+    def encode(self, event):
+        plot_index, kind, track_id, state, az, el, r, doppler, t, hits, misses = event
+        return BINARY_RECORD.pack(plot_index, track_id, EVENT_KINDS.index(kind), TRACK_STATES.index(state),
+                                  az, el, r, doppler, t, hits, misses)
+
+def read_binary_events(path):
+    with open(path, 'rb') as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError("Not a track event file.")
+        data = f.read()
+    events = []
+    for record in BINARY_RECORD.iter_unpack(data):
+        plot_index, track_id, kind, state, az, el, r, doppler, t, hits, misses = record
+        events.append((plot_index, EVENT_KINDS[kind], track_id, TRACK_STATES[state],
+                       az, el, r, doppler, t, hits, misses))
+    return events
+
+_SINKS_BY_EXTENSION = {'.csv': CsvSink, '.jsonl': JsonLinesSink, '.bin': BinarySink}
+
+# Pick a sink from the output file extension (.csv, .jsonl or .bin)
+def open_sink(path, buffer_size=None):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _SINKS_BY_EXTENSION:
+        raise ValueError(f"Unsupported output format '{extension}'. Choose .csv, .jsonl or .bin.")
+    sink_class = _SINKS_BY_EXTENSION[extension]
+    return sink_class(path) if buffer_size is None else sink_class(path, buffer_size)
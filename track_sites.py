@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+
+# Multi-site support: put plots from several radar sites into one shared ENU frame before
+# gating. Each site has a position in that frame (east, north, up) and an orientation
+# (yaw, pitch, roll in degrees) of its local sph2cart axes; the rotation matrices are
+# built once per site and whole batches are converted in a single vectorized step.
+
+def _rotation_matrix(yaw, pitch, roll):
+    yaw, pitch, roll = np.radians([yaw, pitch, roll])
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cr, sr = np.cos(roll), np.sin(roll)
+    rz = np.array([[cy, -sy, 0.0], [sy, cy, 0.0], [0.0, 0.0, 1.0]])
+    ry = np.array([[cp, 0.0, sp], [0.0, 1.0, 0.0], [-sp, 0.0, cp]])
+    rx = np.array([[1.0, 0.0, 0.0], [0.0, cr, -sr], [0.0, sr, cr]])
+    return rz @ ry @ rx
+
+# Function for cartesian to spherical conversion, the inverse of sph2cart (degrees)
+def cart2sph(x, y, z):
+    r = np.sqrt(x * x + y * y + z * z)
+    az = np.degrees(np.arctan2(y, x))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        el = np.degrees(np.arcsin(np.where(r > 0, z / r, 0.0)))
+    return az, el, r
+
+class SiteTransform:
+    # `sites` maps sensor ID to a dict with 'position' (east, north, up) and optional
+    # 'yaw', 'pitch', 'roll' in degrees
+    def __init__(self, sites):
+        self.sensor_ids = list(sites)
+        self._index = {sensor_id: idx for idx, sensor_id in enumerate(self.sensor_ids)}
+        self.rotations = np.stack([_rotation_matrix(site.get('yaw', 0.0), site.get('pitch', 0.0),
+                                                    site.get('roll', 0.0))
+                                   for site in sites.values()])
+        self.positions = np.array([site['position'] for site in sites.values()], dtype=np.float64).reshape(-1, 3)
+
+    def sensor_indices(self, sensor_ids):
+        try:
+            return np.fromiter((self._index[sensor_id] for sensor_id in sensor_ids), dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"No site configured for sensor {e.args[0]!r}.") from None
+
+    # Convert batches of (az, el, r) seen by the given sensors to shared-frame Cartesian
+    # coordinates, shape (N, 3)
+    def to_common(self, sensor_idx, az, el, r):
+        az = np.radians(np.asarray(az, dtype=np.float64))
+        el = np.radians(np.asarray(el, dtype=np.float64))
+        r = np.asarray(r, dtype=np.float64)
+        cos_el = np.cos(el)
+        local = np.stack([r * cos_el * np.cos(az), r * cos_el * np.sin(az), r * np.sin(el)], axis=1)
+        return np.einsum('nij,nj->ni', self.rotations[sensor_idx], local) + self.positions[sensor_idx]
+
+    # Same batch expressed as (az, el, r) about the shared origin, so the existing
+    # sph2cart-based gating works on it unchanged
+    def to_common_spherical(self, sensor_idx, az, el, r):
+        common = self.to_common(sensor_idx, az, el, r)
+        return cart2sph(common[:, 0], common[:, 1], common[:, 2])
+
+    # Re-express a stream of sensor-tagged measurements (az, el, r, doppler, t, sensor_id),
+    # such as merge_measurement_sources yields, in the shared frame, one batch at a time.
+    # Doppler stays the radial rate seen by the originating sensor.
+    def transform_measurements(self, measurements, batch_size=4096):
+        measurements = iter(measurements)
+        while True:
+            batch = list(itertools.islice(measurements, batch_size))
+            if not batch:
+                return
+            columns = list(zip(*batch))
+            sensor_idx = self.sensor_indices(columns[5])
+            az, el, r = self.to_common_spherical(sensor_idx, columns[0], columns[1], columns[2])
+            for measurement, new_az, new_el, new_r in zip(batch, az.tolist(), el.tolist(), r.tolist()):
+                yield (new_az, new_el, new_r) + tuple(measurement[3:])
@@ -0,0 +1,772 @@
+# Headless tracking core shared by the scripts, the GUI and track_cli.py.
+# Only NumPy is imported eagerly; pandas is loaded when a CSV is actually parsed.
+import heapq
+import os
+import time
+
+import numpy as np
+
+# Function for spherical to cartesian conversion
+def sph2cart(az, el, r):
+    az = np.radians(az)
+    el = np.radians(el)
+    x = r * np.cos(el) * np.cos(az)
+    y = r * np.cos(el) * np.sin(az)
+    z = r * np.sin(el)
+    return x, y, z
+
+# Doppler correlation function
+def doppler_correlation(doppler_1, doppler_2, doppler_threshold):
+    return abs(doppler_1 - doppler_2) < doppler_threshold
+
+# Range gating function
+def range_gate(distance, range_threshold):
+    return distance < range_threshold
+
+# Function to manage track IDs with free and occupied states
+def get_next_track_id(track_id_list):
+    for idx, track in enumerate(track_id_list):
+        if track['state'] == 'free':
+            track_id_list[idx]['state'] = 'occupied'
+            return track['id'], idx
+    new_id = len(track_id_list) + 1
+    track_id_list.append({'id': new_id, 'state': 'occupied'})
+    return new_id, len(track_id_list) - 1
+
+# Mark a track ID as free
+def release_track_id(track_id_list, idx):
+    track_id_list[idx]['state'] = 'free'
+
+# Secondary index of live tracks keyed by doppler bins of width doppler_threshold.
+# Two dopplers closer than the threshold always fall in the same or adjacent bins, so a
+# measurement only has to look at three bins. Non-finite dopplers never correlate and
+# are kept out of the index.
+class DopplerBinIndex:
+    def __init__(self, doppler_threshold):
+        if not doppler_threshold > 0:
+            raise ValueError(f"DopplerBinIndex needs a positive doppler_threshold, got {doppler_threshold}.")
+        self.bin_width = doppler_threshold
+        self.bins = {}
+        self.track_bins = {}
+
+    def _bin(self, doppler):
+        if not np.isfinite(doppler):
+            return None
+        return int(np.floor(doppler / self.bin_width))
+
+    # Insert a track or move it to the bin of its new tail doppler
+    def update(self, track_id, doppler):
+        new_bin = self._bin(doppler)
+        old_bin = self.track_bins.get(track_id)
+        if track_id in self.track_bins and old_bin == new_bin:
+            return
+        self.remove(track_id)
+        if new_bin is None:
+            return
+        self.track_bins[track_id] = new_bin
+        self.bins.setdefault(new_bin, set()).add(track_id)
+
+    def remove(self, track_id):
+        old_bin = self.track_bins.pop(track_id, None)
+        if old_bin is None:
+            return
+        members = self.bins[old_bin]
+        members.discard(track_id)
+        if not members:
+            del self.bins[old_bin]
+
+    # Track IDs in the measurement's bin and both neighbours, in ascending order so
+    # first-match association behaves exactly as a full scan would
+    def candidates(self, doppler):
+        center = self._bin(doppler)
+        if center is None:
+            return []
+        found = []
+        for b in (center - 1, center, center + 1):
+            found.extend(self.bins.get(b, ()))
+        found.sort()
+        return found
+
+# Tail range and time of every track slot, with the track's range rate (its tail
+# doppler), in NumPy arrays. For a measurement without doppler, gate() computes the range
+# rate each track would need to reach it and compares that with the track's own rate in
+# one vectorized step. Single-plot tracks have no rate yet and pass on range rate alone.
+# Over intervals shorter than min_baseline seconds range noise dominates the implied
+# rate, so such a plot is allowed the range residual the threshold gives over
+# min_baseline, and it moves the track's rate by only dt / min_baseline of the difference.
+class RangeRateGate:
+    def __init__(self, capacity=64, min_baseline=1.0):
+        self.min_baseline = min_baseline
+        self.ranges = np.full(capacity, np.nan)
+        self.times = np.full(capacity, np.nan)
+        self.rates = np.full(capacity, np.nan)
+        self.size = 0
+
+    def set_tail(self, track_id, measurement):
+        if track_id >= len(self.ranges):
+            extra = max(len(self.ranges), track_id + 1 - len(self.ranges))
+            self.ranges = np.concatenate([self.ranges, np.full(extra, np.nan)])
+            self.times = np.concatenate([self.times, np.full(extra, np.nan)])
+            self.rates = np.concatenate([self.rates, np.full(extra, np.nan)])
+        self.ranges[track_id] = measurement[2]
+        self.times[track_id] = measurement[4]
+        self.rates[track_id] = measurement[3]
+        self.size = max(self.size, track_id + 1)
+
+    def remove(self, track_id):
+        if track_id < self.size:
+            self.ranges[track_id] = np.nan
+            self.times[track_id] = np.nan
+            self.rates[track_id] = np.nan
+
+    # (correlated, rates) over all slots for a plot at range r and time t: whether the plot
+    # fits each track's range rate, and the track's rate once the plot joins it
+    def gate(self, r, t, threshold):
+        n = self.size
+        dt = t - self.times[:n]
+        rates = self.rates[:n]
+        unknown = np.isnan(rates)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            implied = (r - self.ranges[:n]) / dt
+            residual = np.abs(r - (self.ranges[:n] + rates * dt))
+            correlated = (dt > 0) & (unknown | (residual < threshold * np.maximum(dt, self.min_baseline)))
+            weight = np.minimum(dt / self.min_baseline, 1.0)
+            updated = np.where(unknown, implied, rates + weight * (implied - rates))
+        return correlated, updated
+
+# Incremental tracker holding the state initialize_tracks builds, fed one measurement at a time.
+# Slot k of `tracks` always belongs to track_id_list[k]: a track that reuses a released ID
+# takes over that ID's freed slot. (The original loop appended the new track and kept its
+# counters under the reused ID's slot, so tracks and IDs drifted apart and the next
+# deletion of an appended track raised IndexError.)
+# With use_doppler_index=True only tracks in neighbouring doppler bins are gated, so the
+# distance computation is skipped for every track the doppler gate would reject anyway.
+# A doppler_threshold of 0 or less leaves no bins to index and falls back to the full scan.
+# With a predictor (see track_prediction.AlphaBetaPredictor) the range gate measures the
+# distance to each track's predicted position at the measurement time, computed for all
+# tracks in one vectorized step, instead of the distance to the raw last measurement.
+# Each association and state change is handed to the `sinks` (see track_sinks) as it
+# happens. With keep_history=False a track only keeps its last measurement, which is all
+# gating needs, so memory stays flat when the sinks carry the full history.
+# With an `initiation` logic (see track_initiation.MofNInitiation) confirmation and
+# deletion follow its M-of-N bitmask windows instead of firm_threshold, and the per-track
+# hit/miss dicts are only filled in from its arrays when result() is called.
+# A `clutter_map` (see track_clutter.ClutterMap) learns from every plot and drops plots in
+# dense cells before association, or stops them from initiating tracks.
+# With an `archive` (see track_archive.TrackArchive) deleted tracks hand their history to
+# it instead of discarding it, and archive_aged() moves old points of live tracks there.
+# A `query_index` (see track_query.TrackQueryIndex) is kept in step with every track tail
+# and committed once per measurement, so other threads can query it while tracking runs.
+# A `plot_log` (see track_results.PlotLog) gets one columnar row per processed plot.
+# A `load_shedder` (see track_overload.LoadShedder) times every measurement and, over its
+# latency or memory budget, sheds tentative tracks and then throttles initiation.
+# With `metrics` (see track_metrics.TrackerMetrics) every measurement's processing time
+# goes into its latency histogram.
+# With an `initiation_pool` (see track_pairing.InitiationPool) an unassigned plot only
+# starts a track once a kinematically plausible second plot pairs with it; until then it
+# is held in the pool and, like a plot that may not initiate, counts as no miss.
+# With `merge_tolerances` (position, doppler, time) merge_duplicates() runs after every
+# `merge_every` measurements, folding tracks that have split onto the same target.
+# A measurement whose doppler is unknown (NaN, see doppler_column) is doppler-gated on
+# range rate instead: the rate implied by each track's tail must agree with that track's
+# own rate within doppler_threshold. The plot joins the track with the implied rate as its
+# doppler, so every track carries its own range rate.
+class Tracker:
+    def __init__(self, doppler_threshold, range_threshold, firm_threshold, time_threshold,
+                 use_doppler_index=False, predictor=None, sinks=None, keep_history=True, initiation=None,
+                 clutter_map=None, archive=None, query_index=None, plot_log=None,
+                 load_shedder=None, metrics=None, initiation_pool=None, merge_tolerances=None, merge_every=1):
+        self.doppler_threshold = doppler_threshold
+        self.range_threshold = range_threshold
+        self.firm_threshold = firm_threshold
+        self.time_threshold = time_threshold
+        self.tracks = []
+        self.track_id_list = []
+        self.miss_counts = {}
+        self.hit_counts = {}
+        self.tentative_ids = {}
+        self.firm_ids = set()
+        # Live slot -> time of the plot that started its track; with keep_history=False
+        # the track list only holds the tail, so this is the only record of a track's age
+        self.start_times = {}
+        self.processed = 0
+        self.doppler_index = DopplerBinIndex(doppler_threshold) if use_doppler_index and doppler_threshold > 0 else None
+        self.predictor = predictor
+        self.sinks = list(sinks) if sinks else []
+        self.keep_history = keep_history
+        self.initiation = initiation
+        self.clutter_map = clutter_map
+        self.archive = archive
+        self.query_index = query_index
+        self.plot_log = plot_log
+        self.load_shedder = load_shedder
+        self.metrics = metrics
+        self.initiation_pool = initiation_pool
+        if merge_every < 1:
+            raise ValueError("merge_every must be at least 1.")
+        self.merge_tolerances = tuple(merge_tolerances) if merge_tolerances is not None else None
+        self.merge_every = merge_every
+        # Built on the first measurement without doppler
+        self.range_rates = None
+
+    # (hits, misses) of a live track slot, from whichever confirmation logic is in use
+    def counts(self, track_idx):
+        if self.initiation is not None:
+            return self.initiation.hits(track_idx), self.initiation.misses(track_idx)
+        return self.hit_counts.get(track_idx, 0), self.miss_counts.get(track_idx, 0)
+
+    # Hand one event to every sink; see track_sinks.EVENT_FIELDS for the layout
+    def _emit(self, kind, track_idx, measurement):
+        if kind in ('deleted', 'merged', 'shed'):
+            state = 'free'
+        elif track_idx in self.firm_ids:
+            state = 'firm'
+        else:
+            state = 'tentative'
+        hits, misses = self.counts(track_idx)
+        event = (self.processed, kind, self.track_id_list[track_idx]['id'], state,
+                 measurement[0], measurement[1], measurement[2], measurement[3], measurement[4],
+                 hits, misses)
+        for sink in self.sinks:
+            sink.write(event)
+
+    # Drop a track and free its ID
+    def _delete_track(self, track_id, kind='deleted'):
+        if self.sinks:
+            self._emit(kind, track_id, self.tracks[track_id][-1])
+        if self.archive is not None:
+            # A merged track's points live on in the track it merged into; either way the
+            # instance is closed so a reuse of the ID is archived separately
+            segment = [] if kind == 'merged' else self.tracks[track_id]
+            self.archive.add_segment(self.track_id_list[track_id]['id'], segment, closed=True)
+        self.tracks[track_id] = []
+        self.start_times.pop(track_id, None)
+        release_track_id(self.track_id_list, track_id)
+        if self.doppler_index is not None:
+            self.doppler_index.remove(track_id)
+        if self.predictor is not None:
+            self.predictor.remove(track_id)
+        if self.initiation is not None:
+            self.initiation.remove(track_id)
+        if self.query_index is not None:
+            self.query_index.remove(track_id)
+        if self.range_rates is not None:
+            self.range_rates.remove(track_id)
+
+    # Record the outcome of the current plot: kind 0 dropped, 1 initiated, 2 assigned, 3 pooled;
+    # state 0 none, 1 tentative, 2 firm
+    def _log_plot(self, measurement, kind, track_idx=None):
+        if track_idx is None:
+            self.plot_log.record(self.processed, kind, -1, 0, 0, 0, 0, measurement)
+            return
+        hits, misses = self.counts(track_idx)
+        state = 2 if track_idx in self.firm_ids else 1
+        self.plot_log.record(self.processed, kind, track_idx, self.track_id_list[track_idx]['id'], state,
+                             hits, misses, measurement)
+
+    # Stage a track's current tail in the query index
+    def _index_tail(self, track_id, cartesian=None):
+        tail = self.tracks[track_id][-1]
+        if cartesian is None:
+            cartesian = sph2cart(tail[0], tail[1], tail[2])
+        state = 'firm' if track_id in self.firm_ids else 'tentative'
+        self.query_index.update(track_id, self.track_id_list[track_id]['id'], state, tail, cartesian)
+
+    # Apply a gated measurement to a track: hit/miss bookkeeping, history and indexes
+    def _assign(self, track_id, measurement, measurement_cartesian):
+        firm_ids = self.firm_ids
+        became_firm = False
+        if self.initiation is not None:
+            if track_id not in firm_ids and self.initiation.hit(track_id):
+                firm_ids.add(track_id)
+                became_firm = True
+        elif track_id not in firm_ids:
+            hit_counts = self.hit_counts
+            miss_counts = self.miss_counts
+            if track_id in self.tentative_ids:
+                hit_counts[track_id] += 1
+                miss_counts[track_id] = 0
+                if hit_counts[track_id] >= self.firm_threshold:
+                    firm_ids.add(track_id)
+                    became_firm = True
+            else:
+                self.tentative_ids[track_id] = True
+                hit_counts[track_id] = 1
+                miss_counts[track_id] = 0
+        if self.keep_history:
+            self.tracks[track_id].append(measurement)
+        else:
+            self.tracks[track_id] = [measurement]
+        if self.sinks:
+            self._emit('assigned', track_id, measurement)
+            if became_firm:
+                self._emit('firm', track_id, measurement)
+        if self.doppler_index is not None:
+            self.doppler_index.update(track_id, measurement[3])
+        if self.predictor is not None:
+            self.predictor.update(track_id, measurement_cartesian, measurement[4])
+        if self.query_index is not None:
+            self._index_tail(track_id, measurement_cartesian)
+        if self.range_rates is not None:
+            self.range_rates.set_tail(track_id, measurement)
+
+    # Start a tentative track from a measurement; returns its position in `tracks`
+    def _initiate(self, measurement, measurement_cartesian):
+        tracks = self.tracks
+        new_track_id, new_track_idx = get_next_track_id(self.track_id_list)
+        # A reused ID takes over its freed slot, keeping slot k on track_id_list[k]
+        if new_track_idx < len(tracks):
+            tracks[new_track_idx] = [measurement]
+        else:
+            tracks.append([measurement])
+        if self.initiation is not None:
+            self.initiation.start(new_track_idx)
+        else:
+            self.miss_counts[new_track_idx] = 0
+            self.hit_counts[new_track_idx] = 1
+        self.tentative_ids[new_track_idx] = True
+        self.start_times[new_track_idx] = measurement[4]
+        if self.sinks:
+            self._emit('initiated', new_track_idx, measurement)
+        if self.doppler_index is not None:
+            self.doppler_index.update(new_track_idx, measurement[3])
+        if self.predictor is not None:
+            self.predictor.start(new_track_idx, measurement_cartesian, measurement[4])
+        if self.query_index is not None:
+            self._index_tail(new_track_idx, measurement_cartesian)
+        if self.range_rates is not None:
+            self.range_rates.set_tail(new_track_idx, measurement)
+        return new_track_idx
+
+    # Range-rate gate over the current track tails, built from them on first use
+    def _range_rate_gate(self):
+        if self.range_rates is None:
+            self.range_rates = RangeRateGate(max(len(self.tracks), 1))
+            for track_id, track in enumerate(self.tracks):
+                if track:
+                    self.range_rates.set_tail(track_id, track[-1])
+        return self.range_rates
+
+    # Track slots worth gating, in ascending order so the first match is the full scan's:
+    # the slots passing the range-rate gate for a plot without doppler, the doppler
+    # index's neighbouring bins, or every slot
+    def _candidate_ids(self, measurement_doppler, rate_correlated=None):
+        if rate_correlated is not None:
+            return np.flatnonzero(rate_correlated).tolist()
+        if self.doppler_index is not None:
+            return self.doppler_index.candidates(measurement_doppler)
+        return range(len(self.tracks))
+
+    # Associate one measurement; returns the position in `tracks` it was appended to.
+    # With can_initiate=False a plot that matches no track is discarded instead of
+    # starting one, and returns None; it does not count as a miss for other tracks.
+    # `cartesian` may carry the measurement's (x, y, z) when it was already converted.
+    # When the periodic duplicate merge folds the plot's track into another, the kept
+    # track's position is returned.
+    def process(self, measurement, can_initiate=True, cartesian=None):
+        load_shedder = self.load_shedder
+        metrics = self.metrics
+        if load_shedder is None and metrics is None and self.merge_tolerances is None:
+            return self._process(measurement, can_initiate, cartesian)
+        if load_shedder is not None and load_shedder.throttled:
+            can_initiate = False
+        start = time.perf_counter()
+        target_id = self._process(measurement, can_initiate, cartesian)
+        if self.merge_tolerances is not None and self.processed % self.merge_every == 0:
+            for kept, other in self.merge_duplicates(*self.merge_tolerances):
+                if target_id == other:
+                    target_id = kept
+        elapsed = time.perf_counter() - start
+        if metrics is not None:
+            metrics.observe_processing(elapsed)
+        if load_shedder is not None:
+            load_shedder.observe(self, elapsed)
+        return target_id
+
+    def _process(self, measurement, can_initiate, cartesian=None):
+        if self.clutter_map is not None:
+            verdict = self.clutter_map.classify(measurement)
+            if verdict == 'drop':
+                if self.plot_log is not None:
+                    self._log_plot(measurement, 0)
+                self.processed += 1
+                return None
+            if verdict == 'restrict':
+                can_initiate = False
+
+        tracks = self.tracks
+        miss_counts = self.miss_counts
+        firm_ids = self.firm_ids
+        predictor = self.predictor
+        initiation = self.initiation
+
+        if cartesian is None:
+            measurement_cartesian = sph2cart(measurement[0], measurement[1], measurement[2])
+        else:
+            measurement_cartesian = cartesian
+        measurement_doppler = measurement[3]
+        measurement_time = measurement[4]
+
+        assigned = False
+        paired = False
+
+        # NaN doppler: gate on per-track range rate, which also picks the candidates
+        range_rate_mode = measurement_doppler != measurement_doppler
+        rate_correlated = None
+        if range_rate_mode:
+            rate_correlated, updated_rates = self._range_rate_gate().gate(
+                measurement[2], measurement_time, self.doppler_threshold)
+        candidate_ids = self._candidate_ids(measurement_doppler, rate_correlated)
+
+        if predictor is not None and tracks:
+            predicted_distances = predictor.distances(measurement_cartesian, measurement_time)
+
+        for track_id in candidate_ids:
+            track = tracks[track_id]
+            if not track:
+                continue
+
+            last_measurement = track[-1]
+            last_doppler = last_measurement[3]
+            last_time = last_measurement[4]
+
+            if predictor is not None:
+                distance = predicted_distances[track_id]
+            else:
+                last_cartesian = sph2cart(last_measurement[0], last_measurement[1], last_measurement[2])
+                distance = np.linalg.norm(np.array(measurement_cartesian) - np.array(last_cartesian))
+            if range_rate_mode:
+                doppler_correlated = rate_correlated[track_id]
+            else:
+                doppler_correlated = doppler_correlation(measurement_doppler, last_doppler, self.doppler_threshold)
+            range_satisfied = range_gate(distance, self.range_threshold)
+            time_diff = measurement_time - last_time
+
+            if doppler_correlated and range_satisfied and time_diff <= self.time_threshold:
+                assigned = True
+                target_id = track_id
+                break
+
+        if assigned:
+            if range_rate_mode:
+                measurement = measurement[:3] + (float(updated_rates[target_id]),) + tuple(measurement[4:])
+            self._assign(target_id, measurement, measurement_cartesian)
+        elif not can_initiate:
+            if self.plot_log is not None:
+                self._log_plot(measurement, 0)
+            self.processed += 1
+            return None
+        elif self.initiation_pool is not None:
+            # Two-point initiation: hold the plot until a plausible second plot turns up
+            partner = self.initiation_pool.offer(measurement, measurement_cartesian, self.processed)
+            if partner is None:
+                if self.plot_log is not None:
+                    self._log_plot(measurement, 3)
+                self.processed += 1
+                return None
+            partner_measurement, partner_cartesian, partner_index = partner
+            target_id = self._initiate(partner_measurement, partner_cartesian)
+            paired = True
+            # The pooled plot started the track; its log row becomes the initiation
+            if self.plot_log is not None:
+                hits, misses = self.counts(target_id)
+                self.plot_log.relabel(partner_index, 1, target_id, self.track_id_list[target_id]['id'], 1,
+                                      hits, misses)
+            if range_rate_mode:
+                rate = (measurement[2] - partner_measurement[2]) / (measurement_time - partner_measurement[4])
+                measurement = measurement[:3] + (float(rate),) + tuple(measurement[4:])
+            self._assign(target_id, measurement, measurement_cartesian)
+        else:
+            target_id = self._initiate(measurement, measurement_cartesian)
+
+        if initiation is not None:
+            if not assigned:
+                for track_id in initiation.miss_all(exclude=target_id):
+                    if tracks[track_id]:
+                        self._delete_track(track_id)
+        else:
+            for track_id in range(len(tracks)):
+                if track_id not in firm_ids and not assigned:
+                    if track_id in miss_counts:
+                        miss_counts[track_id] += 1
+                        if miss_counts[track_id] > self.firm_threshold and tracks[track_id]:
+                            self._delete_track(track_id)
+
+        if self.query_index is not None:
+            self.query_index.commit()
+        if self.plot_log is not None:
+            self._log_plot(measurement, 2 if assigned or paired else 1, target_id)
+        self.processed += 1
+        return target_id
+
+    # Fold tracks that follow the same target into the lowest track ID among them and
+    # release the others. Two live tracks are duplicates when their tails are closer than
+    # position_tolerance, with dopplers within doppler_tolerance and times within
+    # time_tolerance; the doppler check is skipped when either doppler is unknown (NaN) or
+    # not finite. Tails are bucketed in a spatial hash with cells of position_tolerance,
+    # so only tracks in neighbouring cells are compared; cheap enough to run every scan.
+    # Returns (kept_track_id, merged_track_id) pairs of list positions.
+    def merge_duplicates(self, position_tolerance, doppler_tolerance, time_tolerance):
+        live = [track_id for track_id, track in enumerate(self.tracks) if track]
+        if len(live) < 2:
+            return []
+        tails = np.array([self.tracks[track_id][-1][:5] for track_id in live], dtype=np.float64)
+        positions = np.column_stack(sph2cart(tails[:, 0], tails[:, 1], tails[:, 2]))
+
+        groups = {}
+        parent = list(range(len(live)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        doppler_known = np.isfinite(tails[:, 3])
+        for i, j in _spatial_hash_pairs(positions, position_tolerance):
+            if ((not (doppler_known[i] and doppler_known[j]) or abs(tails[i, 3] - tails[j, 3]) < doppler_tolerance)
+                    and abs(tails[i, 4] - tails[j, 4]) <= time_tolerance):
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        for i in range(len(live)):
+            groups.setdefault(find(i), []).append(live[i])
+
+        merged = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            kept = members[0]
+            for other in members[1:]:
+                self._merge_into(kept, other)
+                merged.append((kept, other))
+        if self.query_index is not None:
+            self.query_index.commit()
+        return merged
+
+    def _merge_into(self, kept, other):
+        # On equal timestamps the kept track's own tail stays the tail
+        if self.keep_history:
+            combined = sorted(self.tracks[other] + self.tracks[kept], key=lambda measurement: measurement[4])
+        else:
+            combined = [max(self.tracks[kept][-1], self.tracks[other][-1], key=lambda measurement: measurement[4])]
+        tail_moved = combined[-1] is not self.tracks[kept][-1]
+        became_firm = other in self.firm_ids and kept not in self.firm_ids
+        if self.initiation is not None:
+            self.initiation.history[kept] |= self.initiation.history[other]
+            if became_firm:
+                self.initiation.firm[kept] = True
+        else:
+            self.hit_counts[kept] = max(self.hit_counts.get(kept, 0), self.hit_counts.get(other, 0))
+            self.miss_counts[kept] = min(self.miss_counts.get(kept, 0), self.miss_counts.get(other, 0))
+        if became_firm:
+            self.firm_ids.add(kept)
+        self.start_times[kept] = min(self.start_times[kept], self.start_times[other])
+
+        self._delete_track(other, kind='merged')
+        self.firm_ids.discard(other)
+        self.tracks[kept] = combined
+        if self.range_rates is not None:
+            self.range_rates.set_tail(kept, combined[-1])
+        if tail_moved:
+            tail = combined[-1]
+            if self.doppler_index is not None:
+                self.doppler_index.update(kept, tail[3])
+        # Keep whichever filter state has seen more plots
+        if self.predictor is not None and self.predictor.updates[other] > self.predictor.updates[kept]:
+            for name in ('positions', 'velocities', 'times', 'updates'):
+                getattr(self.predictor, name)[kept] = getattr(self.predictor, name)[other]
+        if became_firm and self.sinks:
+            self._emit('firm', kept, combined[-1])
+        if self.query_index is not None:
+            self._index_tail(kept)
+
+    # Move every point older than `before_time` out of the live tracks into the archive,
+    # keeping at least each track's tail for gating. Returns the number of points moved.
+    def archive_aged(self, before_time):
+        if self.archive is None:
+            raise ValueError("archive_aged needs a Tracker created with an archive.")
+        moved = 0
+        for track_id, track in enumerate(self.tracks):
+            if len(track) < 2:
+                continue
+            cut = 0
+            while cut < len(track) - 1 and track[cut][4] < before_time:
+                cut += 1
+            if cut:
+                self.archive.add_segment(self.track_id_list[track_id]['id'], track[:cut])
+                self.tracks[track_id] = track[cut:]
+                moved += cut
+        return moved
+
+    def result(self):
+        if self.initiation is not None:
+            started = np.flatnonzero(self.initiation.age[:self.initiation.size] > 0).tolist()
+            hits = self.initiation.hit_counts().tolist()
+            misses = self.initiation.miss_counts().tolist()
+            self.hit_counts = {track_id: hits[track_id] for track_id in started}
+            self.miss_counts = {track_id: misses[track_id] for track_id in started}
+        return self.tracks, self.track_id_list, self.miss_counts, self.hit_counts, self.firm_ids
+
+# Index pairs (i < j) of positions closer than cell_size, found by hashing each point to
+# a cubic cell and only comparing points in the same or adjacent cells
+def _spatial_hash_pairs(positions, cell_size):
+    cells = {}
+    finite = np.isfinite(positions).all(axis=1)
+    keys = np.floor(np.where(finite[:, None], positions, 0.0) / cell_size).astype(np.int64).tolist()
+    for idx, key in enumerate(keys):
+        if finite[idx]:
+            cells.setdefault(tuple(key), []).append(idx)
+
+    pairs = []
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    for (cx, cy, cz), members in cells.items():
+        for dx, dy, dz in offsets:
+            neighbours = cells.get((cx + dx, cy + dy, cz + dz))
+            if not neighbours:
+                continue
+            for i in members:
+                for j in neighbours:
+                    if i < j and np.linalg.norm(positions[i] - positions[j]) < cell_size:
+                        pairs.append((i, j))
+    return pairs
+
+# Function to initialize and update tracks over a whole measurement sequence
+def initialize_tracks(measurements, doppler_threshold, range_threshold, firm_threshold, time_threshold,
+                      use_doppler_index=False, predictor=None, sinks=None, initiation=None):
+    tracker = Tracker(doppler_threshold, range_threshold, firm_threshold, time_threshold,
+                      use_doppler_index=use_doppler_index, predictor=predictor, sinks=sinks,
+                      initiation=initiation)
+    for measurement in measurements:
+        tracker.process(measurement)
+    return tracker.result()
+
+# Doppler values for a chunk of CSV rows. doppler='auto' uses the measured 'doppler'
+# column when the file has one and otherwise leaves doppler unknown (NaN), so the Tracker
+# gates on each track's own range rate instead; doppler='measured' requires the column;
+# doppler='derived' is the old row-to-row range difference over time, which mixes targets
+# when their plots are interleaved. `previous` is the (range, timestamp) of the row before
+# the chunk, for deriving its first value.
+DOPPLER_MODES = ('auto', 'measured', 'derived')
+
+def doppler_column(frame, doppler='auto', previous=None):
+    if doppler not in DOPPLER_MODES:
+        raise ValueError("Invalid doppler mode. Choose 'auto', 'measured' or 'derived'.")
+    if doppler != 'derived':
+        if 'doppler' in frame.columns:
+            return frame['doppler'].to_numpy(dtype=np.float64)
+        if doppler == 'measured':
+            raise ValueError("The measurements have no 'doppler' column.")
+        return np.full(len(frame), np.nan)
+    ranges = frame['range'].to_numpy(dtype=np.float64)
+    timestamps = frame['timestamp'].to_numpy(dtype=np.float64)
+    values = np.zeros(len(frame))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values[1:] = np.diff(ranges) / np.diff(timestamps)
+        if previous is not None and len(frame):
+            values[0] = (ranges[0] - previous[0]) / (timestamps[0] - previous[1])
+    return values
+
+# Load data from CSV, with doppler chosen by `doppler` (see doppler_column). With
+# start_time/end_time only that window is read, through the file's sidecar seek index
+# (see track_seek). precision='float32' rounds every value but the timestamp to single
+# precision, as in load_measurement_columns.
+def load_measurements_from_csv(file_path, start_time=None, end_time=None, doppler='auto', precision='float64'):
+    columns = load_measurement_columns(file_path, precision=precision, start_time=start_time, end_time=end_time,
+                                       doppler=doppler)
+    return list(zip(*(columns[name] for name in MEASUREMENT_COLUMNS)))
+
+MEASUREMENT_COLUMNS = ('azimuth', 'elevation', 'range', 'doppler', 'timestamp')
+
+# Floating-point precision for positions, angles and dopplers. Timestamps always stay
+# float64 so time differences keep their resolution however long the recording runs.
+PRECISIONS = {'float64': np.float64, 'float32': np.float32}
+
+def precision_dtype(precision):
+    if precision not in PRECISIONS:
+        raise ValueError("Invalid precision. Choose 'float64' or 'float32'.")
+    return np.dtype(PRECISIONS[precision])
+
+# Load a CSV as NumPy columns keyed by MEASUREMENT_COLUMNS, with doppler chosen by
+# `doppler` (see doppler_column). With precision='float32' every column but the float64
+# timestamps is stored in single precision; a derived doppler is computed in float64
+# first. start_time/end_time read just that window through the seek index.
+def load_measurement_columns(file_path, precision='float64', start_time=None, end_time=None, doppler='auto'):
+    dtype = precision_dtype(precision)
+    if start_time is not None or end_time is not None:
+        from track_seek import read_time_window
+
+        columns = read_time_window(file_path, start_time, end_time, doppler=doppler)
+    else:
+        import pandas as pd
+
+        df = pd.read_csv(file_path)
+        columns = {
+            'azimuth': df['azimuth'].to_numpy(dtype=np.float64),
+            'elevation': df['elevation'].to_numpy(dtype=np.float64),
+            'range': df['range'].to_numpy(dtype=np.float64),
+            'doppler': doppler_column(df, doppler),
+            'timestamp': df['timestamp'].to_numpy(dtype=np.float64),
+        }
+    return {name: column if name == 'timestamp' else column.astype(dtype, copy=False)
+            for name, column in columns.items()}
+
+# Stream one sensor's CSV in chunks, tagging each measurement with the sensor ID.
+# Doppler is chosen as in load_measurements_from_csv, derived across chunk boundaries.
+def iter_measurements_from_csv(file_path, sensor_id, chunksize=10000, doppler='auto'):
+    import pandas as pd
+
+    previous = None
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        azimuths = chunk['azimuth'].to_numpy()
+        elevations = chunk['elevation'].to_numpy()
+        ranges = chunk['range'].to_numpy()
+        timestamps = chunk['timestamp'].to_numpy()
+        dopplers = doppler_column(chunk, doppler, previous)
+        if len(chunk):
+            previous = (ranges[-1], timestamps[-1])
+        for az, el, r, d, t in zip(azimuths, elevations, ranges, dopplers, timestamps):
+            yield (az, el, r, d, t, sensor_id)
+
+# Tag an in-memory measurement sequence with a sensor ID
+def _tag_measurements(measurements, sensor_id):
+    for measurement in measurements:
+        yield tuple(measurement[:5]) + (sensor_id,)
+
+# Merge many per-sensor sources into one time-ordered stream with a heap-based k-way merge.
+# `sources` is a dict {sensor_id: source} or a list of sources (sensor ID = file name stem,
+# or list position for in-memory sources). A source is a CSV path or an iterable of
+# (az, el, r, doppler, t) tuples. Each source must already be time-ordered; only one
+# pending measurement per source is held, so nothing is concatenated or sorted in memory.
+# Yields (az, el, r, doppler, t, sensor_id); ties on timestamp keep source order.
+def merge_measurement_sources(sources, chunksize=10000, doppler='auto'):
+    if isinstance(sources, dict):
+        items = list(sources.items())
+    else:
+        items = []
+        for idx, source in enumerate(sources):
+            if isinstance(source, (str, os.PathLike)):
+                items.append((os.path.splitext(os.path.basename(source))[0], source))
+            else:
+                items.append((idx, source))
+
+    streams = []
+    for sensor_id, source in items:
+        if isinstance(source, (str, os.PathLike)):
+            streams.append(iter_measurements_from_csv(source, sensor_id, chunksize, doppler))
+        else:
+            streams.append(_tag_measurements(source, sensor_id))
+
+    return heapq.merge(*streams, key=lambda measurement: measurement[4])
+
+# Function to select initiation mode and firm thresholds
+def select_initiation_mode(mode):
+    if mode == '3-state':
+        return 3
+    elif mode == '5-state':
+        return 5
+    elif mode == '7-state':
+        return 7
+    else:
+        raise ValueError("Invalid initiation mode. Choose '3-state', '5-state', or '7-state'.")